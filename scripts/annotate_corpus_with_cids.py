@@ -1,44 +1,78 @@
-import json
 import sys
+from bisect import bisect_right
 from pathlib import Path
 
+import orjson
+
 # Ensure package imports work (src layout)
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 from cidsem.nlp.spo import extract_spo
 from cidsem.utils.factoids import build_factoids
+from cidsem.utils.jsonio import load_json_file
 
 ROOT = Path(__file__).resolve().parents[1]
 CORPUS_PATH = ROOT / "tests" / "fixtures" / "corpus_texts.json"
 
 
+def _find_containing(blob: str, offsets: list, needle: str) -> int:
+    """Return the index of the first text in ``blob`` containing ``needle``.
+
+    ``blob`` is all texts joined with NUL separators and ``offsets`` holds the
+    start of each text, so one str.find over the blob replaces a Python-level
+    loop over the texts. Returns -1 if nothing matches.
+    """
+    pos = blob.find(needle)
+    if pos == -1:
+        return -1
+    return bisect_right(offsets, pos) - 1
+
+
 def main():
-    data = json.loads(CORPUS_PATH.read_text(encoding="utf-8"))
+    data = load_json_file(CORPUS_PATH)
     items = data.get("items", [])
     changed = False
     for it in items:
         text = it.get("text", "")
         triples = extract_spo(text)
         factoids = build_factoids(it.get("id"), text, triples)
+        # index the non-empty factoid texts once: by_text (first factoid per
+        # text) for exact matches, and a NUL-joined blob with each text's
+        # start offset and factoid for substring matches
+        by_text = {}
+        texts = []
+        matched = []
+        offsets = []
+        pos = 0
+        for f in factoids:
+            ftext = f.get("text") or ""
+            if ftext:
+                by_text.setdefault(ftext, f)
+                texts.append(ftext)
+                matched.append(f)
+                offsets.append(pos)
+                pos += len(ftext) + 1
+        blob = "\x00".join(texts)
         # for each expected dict, attempt to find matching factoid and attach cid
         exps = it.get("expected", [])
         for exp in exps:
             if isinstance(exp, dict):
                 exp_text = exp.get("text", "")
-                # find first factoid whose text contains exp_text
-                match = None
-                for f in factoids:
-                    if exp_text and exp_text in (f.get("text") or ""):
-                        match = f
-                        break
+                if not exp_text:
+                    continue
+                # exact text match first, then first factoid containing exp_text
+                match = by_text.get(exp_text)
+                if match is None and "\x00" not in exp_text:
+                    idx = _find_containing(blob, offsets, exp_text)
+                    match = matched[idx] if idx >= 0 else None
                 if match:
                     if exp.get("cid") != match.get("cid"):
                         exp["cid"] = match.get("cid")
                         changed = True
 
     if changed:
-        CORPUS_PATH.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        CORPUS_PATH.write_bytes(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
         )
         print("Updated corpus with CIDs.")
     else:
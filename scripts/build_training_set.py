@@ -4,7 +4,7 @@ from cidsem.build_training_set import build_training_set
 
 ROOT = Path(__file__).resolve().parents[1]
 IN = ROOT / "tests" / "fixtures" / "corpus_texts.json"
-OUT = ROOT / "tests" / "fixtures" / "corpus_training.json"
+OUT = ROOT / "tests" / "fixtures" / "corpus_training.jsonl"
 
 if __name__ == "__main__":
     build_training_set(IN, OUT, use_llm=False)
@@ -11,7 +11,7 @@ print("object lanes:", o.high, o.high_mid, o.low_mid, o.low)
 
 store = InMemoryCidstore()
 client = CidstoreClient(store)
-client.insert_triple(TripleRecord(s, p, o))
+client.insert_triples([TripleRecord(s, p, o)])
 print("store keys:")
 for k, v in store._store.items():
     print(k, v)
@@ -1,13 +1,21 @@
-import json
 import hashlib
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
+import orjson
+
 ROOT = Path(__file__).resolve().parents[1]
 SPEC_PATH = ROOT / "docs" / "specs" / "spec23-Ontology.md"
 OUT_PATH = ROOT / "docs" / "specs" / "ontology.json"
+# compact copy of the same document for programmatic loaders
+MIN_OUT_PATH = OUT_PATH.with_suffix(".min.json")
+COLUMNAR_OUT_PATH = ROOT / "docs" / "specs" / "ontology_columnar.npz"
+# Below this many rows a process pool costs more to start than it saves.
+PARALLEL_MIN_ROWS = 10_000
 
-drop_inverse_ids = {17, 26, 77, 86, 107, 179}
+drop_inverse_ids = frozenset({17, 26, 77, 86, 107, 179})
 
 category_namespace = {
     "Social": "social",
@@ -34,7 +42,7 @@ category_namespace = {
     "Logical": "logical",
 }
 
-multi_predicates = {
+MULTI_PREDICATES: frozenset[str] = frozenset({
     # social relationships and tags
     "follows", "likes", "reactsTo", "bookmarks", "blocks", "mutes", "mentions", "supports", "disagreesWith", "asksAbout", "madeClaimAbout", "hasEvent",
     # identity/ownership
@@ -57,29 +65,51 @@ multi_predicates = {
     "knows", "influences",
     # family
     "childOf", "parentOf",
-}
+})
+
+TEMPORAL_CATEGORIES = frozenset({"temporal", "spatiotemporal"})
+SPATIAL_CATEGORIES = frozenset({"spatial", "spatiotemporal"})
 
 
 def slug_namespace(category: str) -> str:
     return category_namespace.get(category.strip(), re.sub(r"[^a-z0-9]+", "_", category.strip().lower()).strip("_"))
 
 
-def generate_cid(canonical_label: str) -> str:
-    h = hashlib.sha256(canonical_label.encode()).hexdigest()
-    return f"sha256:{h}"
+# Every predicate label starts with "R:", so hash that prefix once and copy the
+# state per predicate instead of building a fresh context each time.
+_CID_BASE = hashlib.sha256(b"R:")
+
+
+def generate_cid(namespace: str, short: str) -> str:
+    h = _CID_BASE.copy()
+    h.update(namespace.encode())
+    h.update(b":")
+    h.update(short.encode())
+    return "sha256:" + h.hexdigest()
 
 
 def parse_spec23():
     text = SPEC_PATH.read_text(encoding="utf-8")
     rows = []
-    pattern = re.compile(r"^\|\s*(\d+)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|", re.MULTILINE)
-    for m in pattern.finditer(text):
-        pid = int(m.group(1))
+    # Table rows look like "| 001 | short | description | category |"; a plain
+    # split is enough and avoids running a regex over every non-table line.
+    for ln in text.splitlines():
+        if not ln.startswith("|"):
+            continue
+        parts = ln.split("|", 5)
+        if len(parts) < 6:
+            continue
+        pid_str = parts[1].strip()
+        if not pid_str.isdigit():
+            continue
+        short = parts[2].strip()
+        desc = parts[3].strip()
+        category = parts[4].strip()
+        if not (short and desc and category):
+            continue
+        pid = int(pid_str)
         if pid in drop_inverse_ids:
             continue
-        short = m.group(2).strip()
-        desc = m.group(3).strip()
-        category = m.group(4).strip()
         rows.append((pid, short, desc, category))
     return rows
 
@@ -87,11 +117,12 @@ def parse_spec23():
 def build_predicate(pid: int, short: str, desc: str, category: str):
     namespace = slug_namespace(category)
     canonical_label = f"R:{namespace}:{short}"
-    cid = generate_cid(canonical_label)
-    temporal = category.lower() in {"temporal", "spatiotemporal"}
-    spatial = category.lower() in {"spatial", "spatiotemporal"}
+    cid = generate_cid(namespace, short)
+    cat = category.lower()
+    temporal = cat in TEMPORAL_CATEGORIES
+    spatial = cat in SPATIAL_CATEGORIES
     sortable = temporal or spatial
-    cardinality = "multi" if short in multi_predicates else "single"
+    cardinality = "multi" if short in MULTI_PREDICATES else "single"
     reversible = False
     inverse_of = None
     return {
@@ -119,9 +150,46 @@ def build_predicate(pid: int, short: str, desc: str, category: str):
     }
 
 
+def build_predicate_row(row):
+    return build_predicate(*row)
+
+
+def build_predicates(rows):
+    if len(rows) < PARALLEL_MIN_ROWS:
+        return [build_predicate(*row) for row in rows]
+    # rows are independent; map preserves input order
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(build_predicate_row, rows, chunksize=64))
+
+
+def build_columns(predicates):
+    """Flatten predicate dicts into column arrays for vectorized filtering.
+
+    Namespaces are dictionary-encoded: ``namespace_ids[i]`` indexes into
+    ``namespaces``. Boolean masks can be combined directly, e.g.
+    ``ids[temporal & ~spatial]``.
+    """
+    n = len(predicates)
+    namespaces = sorted({p["namespace"] for p in predicates})
+    ns_index = {ns: i for i, ns in enumerate(namespaces)}
+    return {
+        "ids": np.fromiter((p["id"] for p in predicates), dtype=np.int32, count=n),
+        "namespace_ids": np.fromiter(
+            (ns_index[p["namespace"]] for p in predicates), dtype=np.int32, count=n
+        ),
+        "temporal": np.fromiter((p["temporal"] for p in predicates), dtype=np.bool_, count=n),
+        "spatial": np.fromiter((p["spatial"] for p in predicates), dtype=np.bool_, count=n),
+        "cardinality_multi": np.fromiter(
+            (p["cardinality"] == "multi" for p in predicates), dtype=np.bool_, count=n
+        ),
+        "namespaces": np.array(namespaces, dtype=np.str_),
+        "labels": np.array([p["label"] for p in predicates], dtype=np.str_),
+    }
+
+
 def main():
     rows = parse_spec23()
-    predicates = [build_predicate(*row) for row in rows]
+    predicates = build_predicates(rows)
     doc = {
         "$schema": "ontology/v1",
         "version": "1.0.0",
@@ -139,8 +207,15 @@ def main():
             }
         ]
     }
-    OUT_PATH.write_text(json.dumps(doc, indent=2), encoding="utf-8")
-    print(f"Wrote {len(predicates)} predicates to {OUT_PATH}")
+    OUT_PATH.write_bytes(
+        orjson.dumps(doc, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    )
+    MIN_OUT_PATH.write_bytes(orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE))
+    # plain (non-object) arrays only, so np.load works without allow_pickle
+    np.savez(COLUMNAR_OUT_PATH, **build_columns(predicates))
+    print(
+        f"Wrote {len(predicates)} predicates to {OUT_PATH}, {MIN_OUT_PATH} and {COLUMNAR_OUT_PATH}"
+    )
 
 
 if __name__ == "__main__":
@@ -44,8 +44,9 @@ def main():
 
     triple = make_sample_triple()
 
-    ok = client.insert_triple(triple)
-    print("insert_triple returned:", ok)
+    # one cidstore batch_insert call and one Redis pipeline for all triples
+    ok = client.insert_triples([triple])
+    print("insert_triples returned:", ok)
 
     # try to read back from redis if enabled
     if client.redis is not None:
@@ -8,12 +8,21 @@ s = re.sub(r"^```[a-zA-Z0-9_-]*\n", "", s)
 s = re.sub(r"\n```\s*$", "", s)
 lines = s.splitlines()
 
-# find header start
+# locate the table header and the label-format note in one pass over the text
+# instead of testing every line against each marker separately
+MARKERS = re.compile(
+    r"^(?:(?P<header>\|\s*ID\s*\|)|(?P<label>[ \t]*(?i:## label format enforcement)))",
+    re.M,
+)
 header_idx = None
-sep_idx = None
-for i, ln in enumerate(lines):
-    if re.match(r"^\|\s*ID\s*\|", ln):
-        header_idx = i
+label_idx = None
+for m in MARKERS.finditer(s):
+    kind = m.lastgroup
+    if kind == "header" and header_idx is None:
+        header_idx = len(s[: m.start()].splitlines())
+    elif kind == "label" and label_idx is None:
+        label_idx = len(s[: m.start()].splitlines())
+    if header_idx is not None and label_idx is not None:
         break
 if header_idx is None:
     raise SystemExit("Table header not found")
@@ -61,14 +70,10 @@ for idx, (short, desc, cat) in enumerate(parsed, start=1):
     id_str = f"{idx:03d}"
     out_lines.append(f"| {id_str} | {short} | {desc} | {cat} |")
 
-# find label format enforcement section if present and append it
+# append the label format enforcement section if present
 label_note = None
-label_idx = None
-for i, ln in enumerate(lines):
-    if ln.strip().lower().startswith("## label format enforcement"):
-        label_idx = i
-        label_note = "\n".join(lines[i:])
-        break
+if label_idx is not None:
+    label_note = "\n".join(lines[label_idx:])
 if label_note is None:
     # fallback default note
     label_note = '\n\n## Label format enforcement\n\nLabel format enforcement: ontology entries must use the fully-qualified form "kind:namespace:label" (exactly two colons between kind, namespace and the human label).\n'
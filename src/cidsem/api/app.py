@@ -1,34 +1,119 @@
 import json
 import os
+import threading
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict
 
 import jsonschema
-from fastapi import FastAPI, HTTPException, Request
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request
 
 from cidsem.nlp.mapper import map_predicate
 from cidsem.nlp.spo import extract_spo
 from cidsem.wal import WAL
 
+try:
+    # Optional: fastjsonschema generates Python code specialised to each
+    # schema, which is much faster than jsonschema's interpretive validators.
+    import fastjsonschema
+except ImportError:  # pragma: no cover - depends on the environment
+    fastjsonschema = None
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 # Allow override via env var for tests or deployments
 SCHEMA_DIR = os.environ.get(
     "CIDSEM_SCHEMA_DIR", os.path.join(ROOT, "docs", "spec", "schemas")
 )
-CAND_SCHEMA = json.load(open(os.path.join(SCHEMA_DIR, "candidate_factoid.v1.json")))
+CAND_SCHEMA = orjson.loads(Path(SCHEMA_DIR, "candidate_factoid.v1.json").read_bytes())
+
+
+def _load_schema(name: str):
+    """Load an optional schema; missing files are reported at request time."""
+    try:
+        return orjson.loads(Path(SCHEMA_DIR, name).read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+if fastjsonschema is not None:
+    _VALIDATION_ERRORS = (
+        jsonschema.ValidationError,
+        fastjsonschema.JsonSchemaValueException,
+    )
+else:
+    _VALIDATION_ERRORS = (jsonschema.ValidationError,)
+
+
+def _validator(schema):
+    """Return a callable validating an instance against ``schema``.
+
+    Validators are built once per schema: compiled with fastjsonschema when it
+    is installed, otherwise a jsonschema validator for the declared draft.
+    Both accept the same instances: fastjsonschema is told not to check
+    ``format`` or fill in defaults, which jsonschema does not do either.
+    """
+    if schema is None:
+        return None
+    if fastjsonschema is not None:
+        return fastjsonschema.compile(schema, use_formats=False, use_default=False)
+    return jsonschema.validators.validator_for(schema)(schema).validate
+
+
+VALD_SCHEMA = _load_schema("validation_event.v1.json")
+BACKLOG_SCHEMA = _load_schema("backlog_item.v1.json")
+
+CAND_VALIDATOR = _validator(CAND_SCHEMA)
+VALD_VALIDATOR = _validator(VALD_SCHEMA)
+BACKLOG_VALIDATOR = _validator(BACKLOG_SCHEMA)
+
+# one open WAL per path; kept until shutdown so no live handle is dropped
+_WALS: Dict[str, WAL] = {}
+_WALS_LOCK = threading.Lock()
 
-app = FastAPI(title="cidsem-api", version="0.1")
 
+def _wal(path: str) -> WAL:
+    with _WALS_LOCK:
+        w = _WALS.get(path)
+        if w is None:
+            w = _WALS[path] = WAL(path)
+        return w
 
-def get_wal():
+
+def close_wals() -> None:
+    """Close every WAL opened by ``get_wal``."""
+    with _WALS_LOCK:
+        for w in _WALS.values():
+            w.close()
+        _WALS.clear()
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    try:
+        yield
+    finally:
+        close_wals()
+
+
+app = FastAPI(title="cidsem-api", version="0.1", lifespan=_lifespan)
+
+
+def get_wal() -> WAL:
+    """Return the shared WAL for the configured path (``CIDSEM_WAL``).
+
+    The WAL keeps its file handle open, so it is constructed once per path
+    rather than on every request.
+    """
     path = os.environ.get("CIDSEM_WAL", os.path.join(os.getcwd(), "data", "wal.log"))
-    return WAL(path)
+    return _wal(path)
 
 
 @app.post("/candidate_factoids")
-async def post_candidate_factoid(request: Request):
+async def post_candidate_factoid(request: Request, w: WAL = Depends(get_wal)):
     body = await request.json()
     # idempotency key optional
     key = request.headers.get("Idempotency-Key")
-    w = get_wal()
     if key and (found := w.find_by_idempotency_key(key)):
         return {"status": "duplicate", "factoid_id": found.get("factoid_id")}
 
@@ -73,8 +158,8 @@ async def post_candidate_factoid(request: Request):
             body["predicate_candidates"] = inferred
 
     try:
-        jsonschema.validate(instance=body, schema=CAND_SCHEMA)
-    except jsonschema.ValidationError as e:
+        CAND_VALIDATOR(body)
+    except _VALIDATION_ERRORS as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     # persist to WAL
@@ -84,30 +169,24 @@ async def post_candidate_factoid(request: Request):
         "idempotency_key": key,
         "payload": body,
     }
-    w.append(record)
+    await w.append_async(record)
 
     return {"status": "accepted", "factoid_id": body.get("factoid_id")}
 
 
 @app.post("/validation_events")
-async def post_validation_event(request: Request):
+async def post_validation_event(request: Request, w: WAL = Depends(get_wal)):
     body = await request.json()
     key = request.headers.get("Idempotency-Key")
-    w = get_wal()
     if key and (found := w.find_by_idempotency_key(key)):
         return {"status": "duplicate", "event_id": found.get("event_id")}
 
-    # lazy-load schema for validation events
-    try:
-        vald_schema = json.load(
-            open(os.path.join(SCHEMA_DIR, "validation_event.v1.json"))
-        )
-    except FileNotFoundError:
+    if VALD_VALIDATOR is None:
         raise HTTPException(status_code=500, detail="validation_event schema not found")
 
     try:
-        jsonschema.validate(instance=body, schema=vald_schema)
-    except jsonschema.ValidationError as e:
+        VALD_VALIDATOR(body)
+    except _VALIDATION_ERRORS as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     record = {
@@ -116,29 +195,24 @@ async def post_validation_event(request: Request):
         "idempotency_key": key,
         "payload": body,
     }
-    w.append(record)
+    await w.append_async(record)
 
     return {"status": "accepted", "event_id": body.get("event_id")}
 
 
 @app.post("/backlog_items")
-async def post_backlog_item(request: Request):
+async def post_backlog_item(request: Request, w: WAL = Depends(get_wal)):
     body = await request.json()
     key = request.headers.get("Idempotency-Key")
-    w = get_wal()
     if key and (found := w.find_by_idempotency_key(key)):
         return {"status": "duplicate", "item_id": found.get("item_id")}
 
-    try:
-        backlog_schema = json.load(
-            open(os.path.join(SCHEMA_DIR, "backlog_item.v1.json"))
-        )
-    except FileNotFoundError:
+    if BACKLOG_VALIDATOR is None:
         raise HTTPException(status_code=500, detail="backlog_item schema not found")
 
     try:
-        jsonschema.validate(instance=body, schema=backlog_schema)
-    except jsonschema.ValidationError as e:
+        BACKLOG_VALIDATOR(body)
+    except _VALIDATION_ERRORS as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     record = {
@@ -147,6 +221,6 @@ async def post_backlog_item(request: Request):
         "idempotency_key": key,
         "payload": body,
     }
-    w.append(record)
+    await w.append_async(record)
 
     return {"status": "accepted", "item_id": body.get("item_id")}
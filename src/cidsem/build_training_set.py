@@ -1,6 +1,6 @@
 """Build a training dataset from the corpus fixtures.
 
-Produces a JSONL-style file where each line is a JSON object with fields:
+Produces a JSONL file where each line is a JSON object with fields:
 - id: factoid id
 - text: factoid text
 - label: the fully-qualified ontology label (or empty string if unmapped)
@@ -10,11 +10,12 @@ Produces a JSONL-style file where each line is a JSON object with fields:
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import List
+
+import orjson
 
 from cidsem.nlp.mapper import map_predicate
+from cidsem.utils.jsonio import load_json_file
 
 
 def build_training_set(
@@ -22,39 +23,36 @@ def build_training_set(
 ) -> None:
     in_path = Path(in_path)
     out_path = Path(out_path)
-    data = json.loads(in_path.read_text(encoding="utf-8"))
+    data = load_json_file(in_path)
     items = data.get("items", [])
-    lines: List[dict] = []
-    for it in items:
-        for exp in it.get("expected", []):
-            if not isinstance(exp, dict):
-                continue
-            txt = exp.get("text", "")
-            mp = map_predicate(txt, use_llm=use_llm)
-            label = ""
-            pcid = None
-            if mp:
-                p = mp.get("predicate", {})
-                fq = p.get("content") or p.get("label") or ""
-                label = fq
-                pcid = p.get("cid")
-                if pcid is not None and not isinstance(pcid, str):
-                    pcid = str(pcid)
-            lines.append({
-                "id": exp.get("id"),
-                "text": txt,
-                "label": label,
-                "predicate_fq": label,
-                "predicate_cid": pcid,
-            })
-
-    out_path.write_text(
-        json.dumps({"items": lines}, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
+    # stream rows straight to a buffered file instead of collecting them all
+    with open(out_path, "wb", buffering=1 << 16) as fh:
+        for it in items:
+            for exp in it.get("expected", []):
+                if not isinstance(exp, dict):
+                    continue
+                txt = exp.get("text", "")
+                mp = map_predicate(txt, use_llm=use_llm)
+                label = ""
+                pcid = None
+                if mp:
+                    p = mp.get("predicate", {})
+                    fq = p.get("content") or p.get("label") or ""
+                    label = fq
+                    pcid = p.get("cid")
+                    if pcid is not None and not isinstance(pcid, str):
+                        pcid = str(pcid)
+                row = {
+                    "id": exp.get("id"),
+                    "text": txt,
+                    "label": label,
+                    "predicate_fq": label,
+                    "predicate_cid": pcid,
+                }
+                fh.write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
 
 
-if __name__ == "__main__":
+def main():
     import argparse
 
     parser = argparse.ArgumentParser()
@@ -63,3 +61,7 @@ if __name__ == "__main__":
     parser.add_argument("--use-llm", action="store_true")
     args = parser.parse_args()
     build_training_set(args.infile, args.outfile, use_llm=args.use_llm)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,19 @@ CLI entrypoint. Reuses existing extractor and mapper from the package.
 from __future__ import annotations
 
 import json
+import re
 from pathlib import Path
 from typing import Optional, Tuple
 
+import orjson
+
 from cidsem.nlp.mapper import map_predicate
 from cidsem.nlp.spo import extract_spo
+from cidsem.utils.jsonio import load_json_file
+
+# fallback verbs, matched case-insensitively in a single scan of the snippet;
+# word boundaries also catch a verb at the end of a clause ("Alice left.")
+_VERB_RE = re.compile(r"\b(joined|hired|left|works|moved|located)\b", re.IGNORECASE)
 
 
 def minimal_llm_to_triplet(snippet: str) -> Tuple[str, str, str]:
@@ -24,28 +32,33 @@ def minimal_llm_to_triplet(snippet: str) -> Tuple[str, str, str]:
         return triples[0]
 
     s = snippet.strip()
-    for verb in (" joined ", " hired ", " left ", " works ", " moved ", " located "):
-        if verb in s.lower():
-            parts = s.split(verb, 1)
-            subj = parts[0].strip().split()[-1] if parts[0].strip() else ""
-            obj = parts[1].strip().split(".")[0].strip()
-            pred = verb.strip()
-            return (subj.lower(), pred.lower(), obj.lower())
+    m = _VERB_RE.search(s)
+    if m:
+        head = s[: m.start()].strip()
+        subj = head.split()[-1] if head else ""
+        obj = s[m.end() :].strip().split(".")[0].strip()
+        return (subj.lower(), m.group(1).lower(), obj.lower())
 
     words = s.split()
-    caps = [w for w in words if w and w[0].isupper()]
-    subj = caps[0].lower() if caps else words[0].lower() if words else ""
-    obj = (
-        caps[-1].lower()
-        if len(caps) > 1
-        else (words[-1].strip(".").lower() if words else "")
-    )
-    try:
-        start = words.index(caps[0]) + 1 if caps else 1
-        end = words.index(caps[-1]) if len(caps) > 1 else len(words) - 1
-        pred = " ".join(words[start:end]).strip().lower()
-    except Exception:
-        pred = ""
+    # positions of the first and last capitalized words, found in one pass
+    first_cap = last_cap = -1
+    for i, w in enumerate(words):
+        if w[0].isupper():
+            if first_cap < 0:
+                first_cap = i
+            last_cap = i
+    several_caps = last_cap > first_cap
+    if first_cap >= 0:
+        subj = words[first_cap].lower()
+    else:
+        subj = words[0].lower() if words else ""
+    if several_caps:
+        obj = words[last_cap].lower()
+    else:
+        obj = words[-1].strip(".").lower() if words else ""
+    start = first_cap + 1 if first_cap >= 0 else 1
+    end = last_cap if several_caps else len(words) - 1
+    pred = " ".join(words[start:end]).strip().lower()
     return (subj, pred, obj)
 
 
@@ -73,7 +86,7 @@ def convert_corpus(
 ) -> None:
     in_path = Path(in_path)
     out_path = Path(out_path)
-    data = json.loads(in_path.read_text(encoding="utf-8"))
+    data = load_json_file(in_path)
     items = data.get("items", [])
     out = {"items": []}
     for it in items:
@@ -99,8 +112,8 @@ def convert_corpus(
         new_it["triplets"] = triplets
         out["items"].append(new_it)
 
-    out_path.write_text(
-        json.dumps(out, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    out_path.write_bytes(
+        orjson.dumps(out, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
     )
 
 
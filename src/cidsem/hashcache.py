@@ -5,62 +5,167 @@ binary serialization of a triple (subject,predicate,object) where each E
 is represented as four 64-bit unsigned integers in big-endian order.
 
 The SHA-256 digest is returned both as a hex string and as an `E` value
-constructed from the 256-bit digest. An LRU cache is used to avoid
+constructed from the 256-bit digest. A bounded FIFO cache is used to avoid
 recomputing hashes for repeated triples.
+
+Setting ``CIDSEM_TRIPLE_HASH=blake3`` switches to a 256-bit BLAKE3 digest
+(requires the optional ``blake3`` package). BLAKE3 is considerably faster
+on these short records, but its digests differ from SHA-256, so stored
+triple hashes are only comparable between deployments using the same
+setting.
 """
 
 from __future__ import annotations
 
 import hashlib
+import os
 import struct
-from functools import lru_cache
-from typing import Tuple
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+import numpy as np
 
 from .keys import E
 
+TRIPLE_HASH = os.getenv("CIDSEM_TRIPLE_HASH", "sha256")
+if TRIPLE_HASH == "blake3":
+    try:
+        from blake3 import blake3 as _hash_fn
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        # no silent fallback: mixing algorithms would give the same triple
+        # different hashes
+        raise ImportError("CIDSEM_TRIPLE_HASH=blake3 requires the blake3 package") from exc
+elif TRIPLE_HASH == "sha256":
+    _hash_fn = hashlib.sha256
+else:
+    raise ValueError(f"unsupported CIDSEM_TRIPLE_HASH: {TRIPLE_HASH!r}")
 
-def _tuple_from_triple(triple) -> Tuple[int, ...]:
-    """Return a flat tuple of 12 integers representing S,P,O (4 lanes each)."""
-    s = triple.subject
-    p = triple.predicate
-    o = triple.object
-    return (
-        int(s.high),
-        int(s.high_mid),
-        int(s.low_mid),
-        int(s.low),
-        int(p.high),
-        int(p.high_mid),
-        int(p.low_mid),
-        int(p.low),
-        int(o.high),
-        int(o.high_mid),
-        int(o.low_mid),
-        int(o.low),
-    )
+# Fresh hash state that every digest is copied from, instead of constructing
+# a new context per call. Any fixed prefix (e.g. a version tag) would be
+# folded in here once.
+_HASH_BASE = _hash_fn()
+
+_MASK64 = (1 << 64) - 1
+# S, P, O as twelve big-endian unsigned 64-bit lanes (96 bytes)
+_PACK12 = struct.Struct(">12Q")
+
+
+# Bounded FIFO cache of tuple key -> (hex_digest, E). A plain dict hit avoids
+# lru_cache's lock and linked-list bookkeeping; most triples are hashed once,
+# so recency ordering buys little. CIDSEM_HASH_CACHE=0 disables caching for
+# strictly single-pass workloads.
+HASH_CACHE_SIZE = 16384
+_HASH_CACHE_ENABLED = os.getenv("CIDSEM_HASH_CACHE", "1") != "0"
+_HASH_CACHE: Dict[Tuple[int, ...], Tuple[str, E]] = {}
+_HASH_ORDER: Deque[Tuple[int, ...]] = deque()
+
+
+def clear_hash_cache() -> None:
+    _HASH_CACHE.clear()
+    _HASH_ORDER.clear()
 
 
-@lru_cache(maxsize=16384)
 def compute_hash_from_tuple(key: Tuple[int, ...]) -> Tuple[str, E]:
     """Compute SHA-256 hex digest and E from a tuple of ints.
 
     key: tuple of 12 ints (s.h, s.hm, s.lm, s.l, p.h, ... , o.l)
     returns (hex_digest, E_from_digest)
     """
-    # Pack as big-endian unsigned 64-bit words
-    b = b"".join(struct.pack(">Q", int(x) & ((1 << 64) - 1)) for x in key)
-    h = hashlib.sha256(b).digest()
-    hexdig = h.hex()
+    if not _HASH_CACHE_ENABLED:
+        return _compute_hash_from_tuple(key)
+    return _cached(key, _compute_hash_from_tuple)
+
+
+def _cached(key: Tuple[int, ...], compute) -> Tuple[str, E]:
+    hit = _HASH_CACHE.get(key)
+    if hit is not None:
+        return hit
+    result = _HASH_CACHE[key] = compute(key)
+    _HASH_ORDER.append(key)
+    if len(_HASH_ORDER) > HASH_CACHE_SIZE:
+        # pop, not del: concurrent misses may have queued the same key twice
+        _HASH_CACHE.pop(_HASH_ORDER.popleft(), None)
+    return result
+
+
+def _compute_hash_from_tuple(key: Tuple[int, ...]) -> Tuple[str, E]:
+    # Pack as big-endian unsigned 64-bit words in one call; only fall back to
+    # masking when a caller passes values outside the 64-bit lane range
+    try:
+        b = _PACK12.pack(*key)
+    except struct.error:
+        b = _PACK12.pack(*(int(x) & _MASK64 for x in key))
+    return _digest_to_result(_digest(b))
+
+
+def _digest(b) -> bytes:
+    h = _HASH_BASE.copy()
+    h.update(b)
+    return h.digest()
+
+
+def _digest_to_result(h: bytes) -> Tuple[str, E]:
     # Convert digest (big-endian) to integer then to E
-    intval = int.from_bytes(h, "big")
-    e = E.from_int(intval)
-    return (hexdig, e)
+    return (h.hex(), E.from_int(int.from_bytes(h, "big")))
+
+
+def compute_hash_from_triple(triple) -> Tuple[str, E]:
+    """Compute (hex_digest, E) for a triple without building the 12-int key.
+
+    Each E already is its four big-endian lanes as one 256-bit int, so three
+    ``to_bytes`` calls give the same 96 bytes as packing the lanes. Uncached.
+    """
+    return _compute_hash_from_ints(
+        (int(triple.subject), int(triple.predicate), int(triple.object))
+    )
+
+
+def _compute_hash_from_ints(key: Tuple[int, int, int]) -> Tuple[str, E]:
+    s, p, o = key
+    b = s.to_bytes(32, "big") + p.to_bytes(32, "big") + o.to_bytes(32, "big")
+    return _digest_to_result(_digest(b))
 
 
 def get_triple_hash(triple) -> Tuple[str, E]:
     """Return cached (hex_digest, E) for the given TripleRecord.
 
-    Uses an LRU cache keyed by the numeric components of the triple.
+    The cache key is the triple's three 256-bit ints, which is much cheaper
+    to build than the 12 lanes; 3-tuples never collide with the 12-lane keys
+    of ``compute_hash_from_tuple``, so both share the bounded cache.
+    """
+    key = (int(triple.subject), int(triple.predicate), int(triple.object))
+    if not _HASH_CACHE_ENABLED:
+        return _compute_hash_from_ints(key)
+    return _cached(key, _compute_hash_from_ints)
+
+
+def _hash_packed(buf: bytes) -> List[Tuple[str, E]]:
+    """Hash consecutive 96-byte S,P,O records of ``buf``."""
+    view = memoryview(buf)
+    results = []
+    copy = _HASH_BASE.copy
+    for i in range(0, len(view), _PACK12.size):
+        h = copy()
+        h.update(view[i : i + _PACK12.size])
+        results.append(_digest_to_result(h.digest()))
+    return results
+
+
+def hash_many(keys) -> List[Tuple[str, E]]:
+    """Return (hex_digest, E) for each row of a ``uint64[N, 12]`` lane array.
+
+    The rows are converted to big-endian bytes in one NumPy call and hashed
+    from that single buffer; digests match ``compute_hash_from_tuple``.
     """
-    key = _tuple_from_triple(triple)
-    return compute_hash_from_tuple(key)
+    arr = np.asarray(keys, dtype=np.uint64).reshape(-1, 12)
+    return _hash_packed(arr.astype(">u8").tobytes())
+
+
+def hash_triples(triples) -> List[Tuple[str, E]]:
+    """Return (hex_digest, E) for each triple, hashing from one packed buffer."""
+    buf = b"".join(
+        int(e).to_bytes(32, "big")
+        for t in triples
+        for e in (t.subject, t.predicate, t.object)
+    )
+    return _hash_packed(buf)
@@ -6,6 +6,9 @@ ZVIC-constrained module: enforces 256-bit CID contracts at runtime.
 from __future__ import annotations
 
 import os
+import struct
+from collections import deque
+from functools import lru_cache
 from uuid import NAMESPACE_DNS, uuid4, uuid5
 
 import numpy as np
@@ -15,15 +18,13 @@ from zvic import constrain_this_module
 from .jackhash import JACK_as_num
 
 
-# Import assumption function inline to avoid circular imports
-def assumption(obj, *expected):
-    for exp in expected:
-        if isinstance(obj, exp):
-            return True
-    raise AssertionError(f"Expected {expected}, got {type(obj).__name__}")
-
-
+# Reverse lookup for E.value. Bounded (oldest entries evicted first) so a
+# long-running process does not keep every string it ever hashed.
+KV_STORE_SIZE = 65536
 _kv_store: dict[int, str] = {}
+_kv_order: deque[int] = deque()
+
+_MASK64 = (1 << 64) - 1
 
 # Enable ZVIC runtime constraint checking if not explicitly disabled.
 # Use environment variable `CIDSEM_ZVIC_ENABLED` (default: "1").
@@ -34,7 +35,11 @@ except Exception:
     # Be conservative on import errors: don't block import if ZVIC is misconfigured.
     pass
 
-# 256-bit E: four 64-bit parts
+# 256-bit E: four 64-bit parts. Bulk tables should keep one contiguous
+# uint64 array per part (see E.to_columns / E.from_columns); the compound
+# KEY_DTYPE is kept for single-row and legacy structured data.
+KEY_COLUMNS = ("high", "high_mid", "low_mid", "low")
+
 KEY_DTYPE = np.dtype([
     ("high", "<u8"),
     ("high_mid", "<u8"),
@@ -56,6 +61,29 @@ HASH_ENTRY_DTYPE = np.dtype([
 ])
 
 
+_PACK4 = struct.Struct(">4Q")
+
+
+def _pack4(a: int, b: int, c: int, d: int) -> int:
+    """Combine four 64-bit parts (high first) into one 256-bit int.
+
+    Raises struct.error if a part is not a 64-bit unsigned value.
+    """
+    # one C-level pack + from_bytes instead of three 256-bit shift/or temporaries
+    return int.from_bytes(_PACK4.pack(a, b, c, d), "big")
+
+
+def _unpack4(v: int) -> tuple[int, int, int, int]:
+    """Split a 256-bit int into its four 64-bit parts (high first)."""
+    return _PACK4.unpack(v.to_bytes(32, "big"))
+
+
+@lru_cache(maxsize=65536)
+def _str_to_int(value: str) -> int:
+    # Use SHA-based deterministic namespace via uuid5 for backward compatibility in some places
+    return uuid5(NAMESPACE_DNS, value).int
+
+
 class E(int):
     """
     E: 256-bit entity identifier for CIDStore keys/values.
@@ -83,12 +111,16 @@ class E(int):
         if isinstance(id_, (list, tuple, np.void)):
             # Require 4-part tuple/list for E in the greenfield design
             if len(id_) == 4:
-                for i in id_:
-                    assert assumption(i, int, np.uint64)
-                a, b_, c, d = id_
-                return cls.from_int(
-                    (int(a) << 192) | (int(b_) << 128) | (int(c) << 64) | int(d)
+                # plain isinstance asserts: no helper frames, stripped under -O
+                assert all(isinstance(i, (int, np.uint64)) for i in id_), (
+                    f"E parts must be int or np.uint64, got {[type(i).__name__ for i in id_]}"
                 )
+                a, b_, c, d = id_
+                try:
+                    v = _pack4(int(a), int(b_), int(c), int(d))
+                except struct.error:
+                    raise AssertionError("E parts must be 64-bit unsigned integers") from None
+                return super().__new__(cls, v)
             else:
                 raise AssertionError("input list/tuple must be length 4 for E")
         if id_ is None:
@@ -101,38 +133,73 @@ class E(int):
 
     @property
     def high(self) -> "int[_ >= 0 and _ < (1 << 64)]":
-        return (self >> 192) & ((1 << 64) - 1)
+        return (int(self) >> 192) & _MASK64
 
     @property
     def high_mid(self) -> "int[_ >= 0 and _ < (1 << 64)]":
-        return (self >> 128) & ((1 << 64) - 1)
+        return (int(self) >> 128) & _MASK64
 
     @property
     def low_mid(self) -> "int[_ >= 0 and _ < (1 << 64)]":
-        return (self >> 64) & ((1 << 64) - 1)
+        return (int(self) >> 64) & _MASK64
 
     @property
     def low(self) -> "int[_ >= 0 and _ < (1 << 64)]":
-        return self & ((1 << 64) - 1)
+        return int(self) & _MASK64
+
+    def parts(self) -> tuple[int, int, int, int]:
+        """Return (high, high_mid, low_mid, low), splitting the value once."""
+        return _unpack4(int(self))
 
     def __repr__(self) -> str:
         # Represent as E(h,hm,lm,l)
-        return f"E({self.high},{self.high_mid},{self.low_mid},{self.low})"
+        return "E(%d,%d,%d,%d)" % self.parts()
 
     def __str__(self) -> str:
         return self.__repr__()
 
     def to_hdf5(self) -> NDArray[np.void]:
         """Convert to HDF5-compatible array"""
-        return np.array(
-            (self.high, self.high_mid, self.low_mid, self.low), dtype=KEY_DTYPE
+        return np.array(self.parts(), dtype=KEY_DTYPE)
+
+    @staticmethod
+    def to_columns(es) -> tuple[NDArray[np.uint64], ...]:
+        """
+        Split Es into four contiguous uint64 arrays, in KEY_COLUMNS order.
+        """
+        buf = b"".join(int(e).to_bytes(32, "big") for e in es)
+        lanes = np.frombuffer(buf, dtype=">u8").reshape(-1, 4)
+        return tuple(np.ascontiguousarray(lanes.T, dtype=np.uint64))
+
+    @classmethod
+    def from_columns(cls, high, high_mid, low_mid, low) -> list[E]:
+        """
+        Create Es from four parallel uint64 arrays (see to_columns).
+
+        The lanes are combined column-wise instead of row by row; four uint64
+        lanes always fit in 256 bits, so the per-value range check is skipped.
+        """
+        vals = (
+            (np.asarray(high).astype(object) << 192)
+            | (np.asarray(high_mid).astype(object) << 128)
+            | (np.asarray(low_mid).astype(object) << 64)
+            | np.asarray(low).astype(object)
         )
+        new = int.__new__
+        return [new(cls, v) for v in vals.ravel().tolist()]
 
     @classmethod
-    def from_entry(cls, entry: NDArray[np.void]) -> E:
+    def from_entry(cls, entry: NDArray[np.void] | tuple) -> E:
         """
-        Create an E from an HDF5 row. Accepts fields for 4-part entries or legacy 2-part.
+        Create an E from an HDF5 row, or from a tuple of four uint64 parts as
+        read from column-wise (KEY_COLUMNS) storage.
         """
+        if isinstance(entry, tuple):
+            return cls(entry)
+        if entry.dtype.names == KEY_COLUMNS:
+            # exact KEY_DTYPE row: one item() call instead of four field
+            # lookups; uint64 parts always fit, so skip from_int's checks
+            return int.__new__(cls, _pack4(*entry.item()))
         fields = entry.dtype.fields
         if fields is not None:
             # Expect 4-part structured array only
@@ -146,7 +213,7 @@ class E(int):
                 b_ = int(entry["high_mid"])
                 c = int(entry["low_mid"])
                 d = int(entry["low"])
-                return cls.from_int((a << 192) | (b_ << 128) | (c << 64) | d)
+                return int.__new__(cls, _pack4(a, b_, c, d))
             else:
                 raise ValueError(
                     "Input must have 'high','high_mid','low_mid','low' fields for E"
@@ -155,12 +222,24 @@ class E(int):
             "Input must have appropriate high/high_mid/low_mid/low or legacy fields"
         )
 
+    @classmethod
+    def from_entries(cls, arr: NDArray[np.void]) -> list[E]:
+        """
+        Create Es from a structured array of 4-part rows (e.g. KEY_DTYPE) in bulk.
+        """
+        fields = arr.dtype.fields
+        if fields is None or not all(name in fields for name in KEY_COLUMNS):
+            raise ValueError(
+                "Input must have 'high','high_mid','low_mid','low' fields for E"
+            )
+        return cls.from_columns(*(arr[name] for name in KEY_COLUMNS))
+
     @classmethod
     def from_int(cls, id_: "int[_ >= 0 and _ < (1 << 256)]") -> E:
         """
         Create an E from an integer.
         """
-        assert assumption(id_, int)
+        assert isinstance(id_, int), f"Expected int, got {type(id_).__name__}"
         assert id_ is not None and 0 <= id_ < (1 << 256), "ID must be a 256-bit integer"
         return cls(id_)
 
@@ -174,18 +253,25 @@ class E(int):
 
     @classmethod
     def from_str(cls, value: str) -> E:
-        assert assumption(value, str)
-        # Use SHA-based deterministic namespace via uuid5 for backward compatibility in some places
-        id_ = uuid5(NAMESPACE_DNS, value).int
-        _kv_store.setdefault(id_, value)
+        assert isinstance(value, str), f"Expected str, got {type(value).__name__}"
+        id_ = _str_to_int(value)
+        if id_ not in _kv_store:
+            _kv_store[id_] = value
+            _kv_order.append(id_)
+            if len(_kv_order) > KV_STORE_SIZE:
+                # pop, not del: concurrent misses may have queued the same id twice
+                _kv_store.pop(_kv_order.popleft(), None)
         return cls(id_)
 
     @classmethod
-    def from_hdf5(cls, arr: NDArray[np.void]) -> E:
+    def from_hdf5(cls, arr: NDArray[np.void] | tuple) -> E:
         """
         Create an E from an HDF5-compatible array (as produced by to_hdf5).
-        Accepts a numpy structured array with 4 fields.
+        Accepts a numpy structured array with 4 fields, or a tuple of four
+        uint64 parts read from column-wise storage.
         """
+        if isinstance(arr, tuple):
+            return cls(arr)
         assert hasattr(arr, "dtype"), "Input must have a dtype attribute (numpy array)"
         assert arr.dtype == HASH_ENTRY_DTYPE
         assert arr.dtype.fields is not None
@@ -199,4 +285,4 @@ class E(int):
         b_ = int(arr["high_mid"])
         c = int(arr["low_mid"])
         d = int(arr["low"])
-        return cls.from_int((a << 192) | (b_ << 128) | (c << 64) | d)
+        return int.__new__(cls, _pack4(a, b_, c, d))
@@ -6,134 +6,240 @@ select the best candidate index. It can later be replaced by a wrapper around
 an actual local model.
 """
 
-from difflib import SequenceMatcher
+import hashlib
+import inspect
+import os
+from functools import lru_cache
 from typing import Iterable, Optional
 
+import numpy as np
+
+from cidsem.nlp._fuzzy import best_match, human_label
+
 _EMBED_CACHE: dict = {}
-_CLASSIFIER_CACHE: dict = {}
+# sentence-transformers model class, imported on first use by _get_model
+SentenceTransformer = None
+# ((model_name, model class), model) of the loaded model, see _get_model
+_MODEL = None
+# optional directory for persisting label embeddings across restarts
+EMBED_CACHE_DIR = os.environ.get("CIDSEM_EMBED_CACHE_DIR")
+# CIDSEM_EMBED_QUANTIZE=int8 scores labels with int8 embeddings (4x smaller,
+# int32-accumulated dot products) at a small cost in score precision
+EMBED_INT8 = os.environ.get("CIDSEM_EMBED_QUANTIZE", "").lower() == "int8"
+_EMBED_I8_CACHE: dict = {}
+# label sets at least this large are searched with a cached faiss
+# IndexFlatIP when faiss is installed (and int8 scoring is off)
+FAISS_MIN_LABELS = 1024
+_FAISS_CACHE: dict = {}
+
+
+def _get_model(name: str):
+    """Return the sentence-transformers model ``name``, loading it only once."""
+    global _MODEL, SentenceTransformer
+    if SentenceTransformer is None:
+        from sentence_transformers import SentenceTransformer as _st
+
+        SentenceTransformer = _st
+    key = (name, SentenceTransformer)
+    if _MODEL is None or _MODEL[0] != key:
+        model = SentenceTransformer(name)
+        # cached label embeddings belong to the previous model
+        _EMBED_CACHE.clear()
+        _EMBED_I8_CACHE.clear()
+        _FAISS_CACHE.clear()
+        _MODEL = (key, model)
+    return _MODEL[1]
+
+
+@lru_cache(maxsize=None)
+def _encode_normalizes(model_cls) -> bool:
+    """Whether ``model_cls.encode`` accepts ``normalize_embeddings``."""
+    try:
+        params = inspect.signature(model_cls.encode).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        p.name == "normalize_embeddings" or p.kind is p.VAR_KEYWORD for p in params
+    )
+
+
+def _encode_normalized(model, texts: list):
+    """Encode ``texts`` into L2-normalized rows.
+
+    Real sentence-transformers models normalize in their backend
+    (``normalize_embeddings=True``); models whose encode() lacks that option
+    are normalized here, without touching the array encode() returned.
+    """
+    if _encode_normalizes(type(model)):
+        return model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    emb = np.asarray(model.encode(texts, convert_to_numpy=True))
+    if emb.dtype.kind != "f":
+        emb = emb.astype(np.float64)
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return emb / norms
+
+
+def _label_embeddings(model, model_name: str, labels: list):
+    """Return L2-normalized embeddings of ``labels``, computed once per label set.
 
+    With CIDSEM_EMBED_CACHE_DIR set, embeddings are also stored there as
+    .npy files keyed by a hash of the model name and labels.
+    """
+    key = (model_name, tuple(labels))
+    lab_emb = _EMBED_CACHE.get(key)
+    if lab_emb is not None:
+        return lab_emb
+    path = None
+    if EMBED_CACHE_DIR:
+        digest = hashlib.sha256("\0".join((model_name, *labels)).encode("utf-8"))
+        path = os.path.join(EMBED_CACHE_DIR, f"labels-{digest.hexdigest()[:32]}.npy")
+        try:
+            lab_emb = np.load(path)
+        except (OSError, ValueError):
+            lab_emb = None
+    if lab_emb is None:
+        lab_emb = _encode_normalized(model, labels)
+        if path is not None:
+            try:
+                os.makedirs(EMBED_CACHE_DIR, exist_ok=True)
+                np.save(path, lab_emb)
+            except OSError:
+                pass
+    _EMBED_CACHE[key] = lab_emb
+    return lab_emb
+
+
+def _quantize_int8(emb):
+    """Symmetric per-row int8 quantization; returns ``(q, scale)`` with emb ~ q * scale."""
+    scale = np.abs(emb).max(axis=1, keepdims=True) / 127.0
+    scale[scale == 0] = 1.0
+    q = np.rint(emb / scale).astype(np.int8)
+    return q, scale[:, 0]
+
+
+def _cosine_scores(model_name: str, labels: list, lab_emb, ph_emb):
+    """Cosine similarities (labels x phrases) of normalized phrase rows against every label row."""
+    if not EMBED_INT8:
+        return lab_emb @ ph_emb.T
+    key = (model_name, tuple(labels))
+    quantized = _EMBED_I8_CACHE.get(key)
+    if quantized is None:
+        quantized = _EMBED_I8_CACHE[key] = _quantize_int8(lab_emb)
+    lab_q, lab_scale = quantized
+    ph_q, ph_scale = _quantize_int8(ph_emb)
+    dots = lab_q.astype(np.int32) @ ph_q.astype(np.int32).T
+    return dots * lab_scale[:, None] * ph_scale[None, :]
+
+
+def _faiss_index(model_name: str, labels: list, lab_emb):
+    """Return a cached inner-product faiss index over ``lab_emb``, or None.
+
+    None when faiss is not installed, int8 scoring is enabled or the label
+    set is below FAISS_MIN_LABELS (a plain matrix product is faster there).
+    """
+    if EMBED_INT8 or len(labels) < FAISS_MIN_LABELS:
+        return None
+    key = (model_name, tuple(labels))
+    index = _FAISS_CACHE.get(key)
+    if index is None:
+        try:
+            import faiss
+        except ImportError:
+            return None
+        index = faiss.IndexFlatIP(lab_emb.shape[1])
+        index.add(np.ascontiguousarray(lab_emb, dtype=np.float32))
+        _FAISS_CACHE[key] = index
+    return index
 
-def _score(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
 
+def _embedding_choices(phrases: list, predicates: list) -> list:
+    """Nearest-label choice (or None below the 0.5 cosine gate) for each phrase.
 
-def _human_label(p: dict) -> str:
-    full_label = p.get("label") or p.get("content") or ""
-    parts = full_label.split(":", 2)
-    return parts[2] if len(parts) == 3 else full_label
+    Raises if sentence-transformers (or numpy) is unavailable.
+    """
+    model_name = "all-MiniLM-L6-v2"
+    labels = [human_label(p) for p in predicates]
+    model = _get_model(model_name)
+    lab_emb = _label_embeddings(model, model_name, labels)
+
+    # kNN via cosine similarity: label rows are unit vectors, so a single
+    # matrix product against the normalized phrase embeddings scores every
+    # (label, phrase) pair
+    ph_emb = _encode_normalized(model, phrases)
+    if not labels:
+        return [None] * len(phrases)
+    index = _faiss_index(model_name, labels, lab_emb)
+    if index is not None:
+        sims, ids = index.search(np.ascontiguousarray(ph_emb, dtype=np.float32), 1)
+        return [
+            int(i) if i >= 0 and sim >= 0.5 else None
+            for i, sim in zip(ids[:, 0].tolist(), sims[:, 0].tolist())
+        ]
+    sims = _cosine_scores(model_name, labels, lab_emb, ph_emb)
+    best = sims.argmax(axis=0)
+    ok = sims[best, np.arange(len(phrases))] >= 0.5
+    return [int(i) if hit else None for i, hit in zip(best.tolist(), ok.tolist())]
+
+
+def _fuzzy_choice(phrase: str, predicates: list) -> Optional[int]:
+    """Deterministic fuzzy-matching fallback for choose_predicate."""
+    best_i, best_score = best_match(
+        phrase.lower(), [human_label(p).lower() for p in predicates]
+    )
+    if best_score >= 0.55:
+        return best_i
+    return None
+
+
+def _exact_index(predicates: list) -> dict:
+    """Map each lowercased human label to the index of its first predicate."""
+    index: dict = {}
+    for i, p in enumerate(predicates):
+        index.setdefault(human_label(p).lower(), i)
+    return index
 
 
 def choose_predicate(phrase: str, predicates: Iterable[dict]) -> Optional[int | dict]:
     """Choose the best predicate from a list.
 
-    Preferred strategy: use a sentence-transformers embedding model (PyTorch)
-    to embed ontology human labels and the phrase, then pick the highest
-    cosine-similarity candidate. If required libraries are missing, fall
-    back to a deterministic fuzzy-matching approach.
+    A phrase equal (case-insensitively) to a predicate's human label picks
+    that predicate directly. Otherwise the preferred strategy is to use a
+    sentence-transformers embedding model (PyTorch) to embed ontology human
+    labels and the phrase, then pick the nearest label by cosine
+    similarity. If required libraries are missing, fall back to a
+    deterministic fuzzy-matching approach.
 
     Returns either the selected predicate index or None.
     """
-    # Try to use sentence-transformers (PyTorch) for embeddings if available.
+    predicates = list(predicates)
+    exact = _exact_index(predicates).get(phrase.lower())
+    if exact is not None:
+        return exact
     try:
-        # Prefer a PyTorch linear classifier trained on top of sentence-transformers
-        import numpy as np
-        from sentence_transformers import SentenceTransformer
+        return _embedding_choices([phrase], predicates)[0]
+    except Exception:
+        return _fuzzy_choice(phrase, predicates)
 
-        try:
-            import torch
-            import torch.nn as nn
-        except Exception:
-            torch = None
-
-        model_name = "all-MiniLM-L6-v2"
-        labels = [_human_label(p) for p in predicates]
-        key = (model_name, tuple(labels))
-
-        # If a classifier exists in cache for these labels, use it
-        if key in _CLASSIFIER_CACHE and torch is not None:
-            clf, lab_emb, model = _CLASSIFIER_CACHE[key]
-            # embed phrase
-            ph_emb = model.encode([phrase], convert_to_numpy=True)
-            ph_emb = ph_emb / (np.linalg.norm(ph_emb, axis=1, keepdims=True) + 1e-12)
-            ph = torch.from_numpy(ph_emb).float()
-            logits = clf(ph).detach().numpy()[0]
-            best_i = int(int(np.argmax(logits)))
-            best_score = float(np.max(logits))
-            # convert logits to a softmax-like confidence roughly
-            probs = np.exp(logits) / np.sum(np.exp(logits))
-            if probs[best_i] >= 0.3:
-                return best_i
-            return None
 
-        # otherwise form embeddings and either train classifier or fall back to kNN
-        model = SentenceTransformer(model_name)
-        lab_emb = model.encode(labels, convert_to_numpy=True)
-        # normalize rows
-        norms = np.linalg.norm(lab_emb, axis=1, keepdims=True)
-        norms[norms == 0] = 1.0
-        lab_emb = lab_emb / norms
-        _EMBED_CACHE[key] = lab_emb
-
-        # If torch is available, train a tiny linear classifier on the label embeddings
-        if "torch" in globals() and torch is not None:
-            X = torch.from_numpy(lab_emb).float()
-            y = torch.arange(0, X.shape[0], dtype=torch.long)
-
-            class LinearClf(nn.Module):
-                def __init__(self, in_dim, out_dim):
-                    super().__init__()
-                    self.linear = nn.Linear(in_dim, out_dim)
-
-                def forward(self, x):
-                    return self.linear(x)
-
-            clf = LinearClf(X.shape[1], X.shape[0])
-            opt = torch.optim.Adam(clf.parameters(), lr=0.05)
-            loss_fn = nn.CrossEntropyLoss()
-            # train for a small number of epochs; this is cheap for <100 classes
-            for epoch in range(200):
-                opt.zero_grad()
-                logits = clf(X)
-                loss = loss_fn(logits, y)
-                loss.backward()
-                opt.step()
-
-            # cache classifier
-            _CLASSIFIER_CACHE[key] = (clf, lab_emb, model)
-
-            # embed phrase and predict
-            ph_emb = model.encode([phrase], convert_to_numpy=True)
-            ph_emb = ph_emb / (np.linalg.norm(ph_emb, axis=1, keepdims=True) + 1e-12)
-            ph = torch.from_numpy(ph_emb).float()
-            logits = clf(ph).detach().numpy()[0]
-            import numpy as _np
-
-            best_i = int(int(_np.argmax(logits)))
-            probs = _np.exp(logits) / _np.sum(_np.exp(logits))
-            if probs[best_i] >= 0.3:
-                return best_i
-            return None
+def choose_predicates(phrases: Iterable[str], predicates: Iterable[dict]) -> list:
+    """Batch variant of choose_predicate: one choice (index or None) per phrase.
 
-        # fallback kNN via cosine similarity
-        ph_emb = model.encode([phrase], convert_to_numpy=True)
-        ph_emb = ph_emb / (np.linalg.norm(ph_emb, axis=1, keepdims=True) + 1e-12)
-        sims = (lab_emb @ ph_emb[0]).tolist()
-        best_i = int(max(range(len(sims)), key=lambda i: sims[i])) if sims else None
-        best_score = float(sims[best_i]) if best_i is not None else 0.0
-        if best_score >= 0.5:
-            return best_i
-        return None
+    Phrases without an exact label match are embedded in one encode call
+    and scored with a single matrix product.
+    """
+    phrases = list(phrases)
+    predicates = list(predicates)
+    exact = _exact_index(predicates)
+    out = [exact.get(phrase.lower()) for phrase in phrases]
+    todo = [i for i, choice in enumerate(out) if choice is None]
+    if not todo:
+        return out
+    rest = [phrases[i] for i in todo]
+    try:
+        choices = _embedding_choices(rest, predicates)
     except Exception:
-        # fallback to fuzzy matching (deterministic)
-        best_i = None
-        best_score = 0.0
-        phrase_norm = phrase.lower()
-        for i, p in enumerate(predicates):
-            human = _human_label(p)
-            sc = _score(phrase_norm, human.lower())
-            if sc > best_score:
-                best_score = sc
-                best_i = i
-        if best_score >= 0.55:
-            return best_i
-        return None
+        choices = [_fuzzy_choice(phrase, predicates) for phrase in rest]
+    for i, choice in zip(todo, choices):
+        out[i] = choice
+    return out
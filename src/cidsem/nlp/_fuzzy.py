@@ -0,0 +1,70 @@
+"""Fuzzy string scoring shared by the predicate mapper and the llm fallback.
+
+Uses rapidfuzz's ``fuzz.ratio`` when it is installed and
+difflib.SequenceMatcher.ratio otherwise. The two are not the same measure:
+rapidfuzz computes the normalized Indel (LCS-based) similarity, while
+SequenceMatcher sums greedily found matching blocks (with its autojunk
+heuristic), so scores and therefore matches near a threshold can differ
+between environments with and without rapidfuzz.
+"""
+
+from difflib import SequenceMatcher
+
+try:  # optional dependency
+    from rapidfuzz import fuzz as _fuzz
+    from rapidfuzz import process as _process
+except ImportError:  # pragma: no cover - depends on the environment
+    _fuzz = _process = None
+
+HAVE_RAPIDFUZZ = _process is not None
+
+
+def human_label(p: dict) -> str:
+    """Return the human part of a 'kind:namespace:label...' predicate label.
+
+    Everything after the second ':' is the human label (it may contain
+    colons); the ontology may use either 'label' or 'content' for the
+    fully-qualified string.
+    """
+    full_label = p.get("label") or p.get("content") or ""
+    parts = full_label.split(":", 2)
+    return parts[2] if len(parts) == 3 else full_label
+
+
+def score(a: str, b: str) -> float:
+    """Similarity of ``a`` and ``b`` in [0, 1]."""
+    if _fuzz is not None:
+        return _fuzz.ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def best_match(query: str, labels: list) -> tuple:
+    """Return ``(index, score)`` of the first best-scoring label, or ``(None, 0.0)``."""
+    if _process is not None:
+        hit = _process.extractOne(query, labels, scorer=_fuzz.ratio)
+        if hit is None or hit[1] <= 0:
+            return None, 0.0
+        return hit[2], hit[1] / 100.0
+    best_i = None
+    best_score = 0.0
+    for i, label in enumerate(labels):
+        sc = SequenceMatcher(None, query, label).ratio()
+        if sc > best_score:
+            best_score = sc
+            best_i = i
+    return best_i, best_score
+
+
+def score_matrix(queries: list, labels: list):
+    """Scores of every query against every label as a float64 array, in [0, 1].
+
+    Computed in one rapidfuzz ``cdist`` call when available.
+    """
+    import numpy as np
+
+    if _process is not None:
+        return _process.cdist(queries, labels, scorer=_fuzz.ratio, dtype=np.float64) / 100.0
+    return np.array(
+        [[SequenceMatcher(None, q, label).ratio() for label in labels] for q in queries],
+        dtype=np.float64,
+    ).reshape(len(queries), len(labels))
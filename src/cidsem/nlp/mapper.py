@@ -1,10 +1,12 @@
+import copy
 import json
 import json as _json
 import os
 import time
-from difflib import SequenceMatcher
 from functools import lru_cache
+from typing import NamedTuple
 
+from cidsem.nlp._fuzzy import HAVE_RAPIDFUZZ, best_match, score, score_matrix
 from cidsem.nlp.normalizer import normalize_predicate
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
@@ -12,17 +14,45 @@ SCHEMA_DIR = os.environ.get("CIDSEM_SCHEMA_DIR", os.path.join(ROOT, "docs", "spe
 ONTO_FILE = os.path.join(SCHEMA_DIR, "ontology.json")
 
 
-def load_ontology():
+class _OntologyIndex(NamedTuple):
+    """A parsed ontology plus per-predicate values derived from it."""
+
+    ont: dict
+    human_labels: list
+    human_labels_lower: list
+    pred_ids: list
+    # lowercased human label -> index of the first predicate carrying it
+    label_index: dict
+
+
+def _pred_id(p: dict) -> str:
+    """Stable identifier of predicate ``p``: its cid or its JSON-serialized entity."""
+    pcid = p.get("cid")
+    if pcid is None and isinstance(p.get("entity"), dict):
+        try:
+            pcid = _json.dumps(p.get("entity"), sort_keys=True)
+        except Exception:
+            pcid = str(p.get("entity"))
+    if not isinstance(pcid, str):
+        pcid = str(pcid)
+    return pcid
+
+
+@lru_cache(maxsize=4)
+def _load_ontology_index(path: str, mtime) -> _OntologyIndex:
+    # ``mtime`` is only part of the cache key, see _ontology_index()
     try:
-        ont = json.load(open(ONTO_FILE))
+        with open(path) as fh:
+            ont = json.load(fh)
     except FileNotFoundError:
-        return {"predicates": []}
+        return _OntologyIndex({"predicates": []}, [], [], [], {})
 
     # Basic validation: each predicate should provide a fully-qualified
     # label/content with the form 'kind:namespace:label...' (at least two
     # ':' separators) and either a 'cid' or an 'entity' dict so callers can
     # obtain a stable identifier.
     preds = ont.get("predicates", []) or []
+    human_labels = []
     for i, p in enumerate(preds):
         full_label = p.get("label") or p.get("content") or ""
         parts = full_label.split(":", 2)
@@ -36,12 +66,56 @@ def load_ontology():
             raise ValueError(
                 f"ontology predicate at index {i} missing 'cid' or 'entity' identifier: {full_label!r}"
             )
+        # everything after the second ':' is the human label (may contain colons)
+        human_labels.append(parts[2])
+
+    human_labels_lower = [label.lower() for label in human_labels]
+    label_index: dict = {}
+    for i, label in enumerate(human_labels_lower):
+        label_index.setdefault(label, i)
+    return _OntologyIndex(
+        ont,
+        human_labels,
+        human_labels_lower,
+        [_pred_id(p) for p in preds],
+        label_index,
+    )
+
+
+def _ontology_index() -> _OntologyIndex:
+    """Return the parsed ontology index, reparsing only when the file changes."""
+    return _load_ontology_index(*_ontology_stamp())
+
+
+def load_ontology():
+    """Return the parsed ontology. The dict is cached; treat it as read-only."""
+    return _ontology_index().ont
+
+
+def _clear_ontology_cache() -> None:
+    """Drop the cached ontology and every lookup memoized against it.
+
+    The caches already follow (path, mtime) changes; this is for forcing a
+    reload when an edit cannot be told apart by mtime.
+    """
+    _load_ontology_index.cache_clear()
+    _map_predicate_rules.cache_clear()
+    _rank_candidates_rules.cache_clear()
+
 
-    return ont
+def _ontology_stamp():
+    """Return a (path, mtime) pair identifying the current ontology file."""
+    try:
+        return ONTO_FILE, os.stat(ONTO_FILE).st_mtime_ns
+    except OSError:
+        return ONTO_FILE, None
 
 
-def _score(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
+@lru_cache(maxsize=8192)
+def _map_predicate_rules(phrase: str, threshold: float, stamp) -> dict | None:
+    # ``stamp`` is only part of the cache key so edits to (or swapping of)
+    # the ontology file invalidate previously memoized matches.
+    return _map_predicate(phrase, threshold, False)
 
 
 def map_predicate(
@@ -49,10 +123,23 @@ def map_predicate(
 ) -> dict | None:
     """Map a predicate phrase to the best ontology predicate if above threshold.
     Returns the matching predicate dict or None.
+
+    Rule-based lookups are memoized per phrase for the current ontology
+    file; LLM-assisted lookups are always recomputed.
     """
-    ont = load_ontology()
-    best = None
-    best_score = 0.0
+    if use_llm:
+        return _map_predicate(phrase, threshold, True)
+    res = _map_predicate_rules(phrase, threshold, _ontology_stamp())
+    if res is None:
+        return None
+    # hand out deep copies so callers cannot mutate the memoized result,
+    # including nested ontology values such as lists of aliases
+    return copy.deepcopy(res)
+
+
+def _map_predicate(phrase: str, threshold: float, use_llm: bool) -> dict | None:
+    index = _ontology_index()
+    ont = index.ont
     # normalize phrase locally before matching
     norm = normalize_predicate(phrase)
 
@@ -62,56 +149,183 @@ def map_predicate(
             # import here to avoid optional dependency at module import time
             from cidsem import llm
 
+            choice = llm.choose_predicate(norm, ont.get("predicates", []))
+            idx = _choice_index(choice, ont.get("predicates", []))
+            if idx is not None:
+                return _predicate_result(index, idx, 1.0)
+        except Exception:
+            # fall back to fuzzy matching below
+            pass
+    # an exact label hit is the best possible fuzzy score, so skip the scan
+    query = norm.lower()
+    exact = index.label_index.get(query) if query else None
+    if exact is not None:
+        return _predicate_result(index, exact, 1.0) if threshold <= 1.0 else None
+    # fuzzy-match against the precomputed lowercased human labels (the part
+    # of 'kind:namespace:label...' after the second ':')
+    best_i, best_score = best_match(query, index.human_labels_lower)
+    if best_i is not None and best_score >= threshold:
+        return _predicate_result(index, best_i, best_score)
+    return None
+
+
+def _choice_index(choice, preds: list) -> int | None:
+    """Resolve an llm choice (an index or a predicate dict) to an index."""
+    if choice is None or isinstance(choice, int):
+        return choice
+    # attempt to find the predicate dict in ontology list
+    try:
+        return preds.index(choice)
+    except ValueError:
+        return None
+
+
+def _predicate_result(index: _OntologyIndex, i: int, score: float) -> dict:
+    # Return a copy of the matched predicate with a normalized human
+    # 'label' field containing the extracted human_label so callers can
+    # rely on p['label'] regardless of the original ontology field name.
+    # The label was split once when the ontology was loaded. The copy is
+    # deep: the ontology itself is cached and shared by all callers.
+    pred = copy.deepcopy(index.ont.get("predicates", [])[i])
+    pred["label"] = index.human_labels[i]
+    return {"predicate": pred, "score": score}
+
+
+def map_predicates(
+    phrases, threshold: float = 0.6, use_llm: bool = False
+) -> list:
+    """Map many predicate phrases at once; one map_predicate result per phrase.
+
+    With rapidfuzz installed, all phrases are scored against the labels in a
+    single ``score_matrix`` call; with ``use_llm`` the optional llm module
+    is asked for all choices in one batch (``choose_predicates``) when it
+    provides one.
+    """
+    phrases = list(phrases)
+    if not use_llm and not HAVE_RAPIDFUZZ:
+        # the cached single-phrase path is already the fastest option
+        return [map_predicate(p, threshold) for p in phrases]
+
+    index = _ontology_index()
+    preds = index.ont.get("predicates", [])
+    norms = [normalize_predicate(p) for p in phrases]
+    out: list = [None] * len(phrases)
+    todo = list(range(len(phrases)))
+
+    if use_llm:
+        try:
+            # import here to avoid optional dependency at module import time
+            from cidsem import llm
+
+            choose_many = getattr(llm, "choose_predicates", None)
+            if choose_many is not None:
+                choices = list(choose_many(norms, preds))
+            else:
+                choices = [llm.choose_predicate(norm, preds) for norm in norms]
+            for i, choice in enumerate(choices):
+                idx = _choice_index(choice, preds)
+                if idx is not None:
+                    out[i] = _predicate_result(index, idx, 1.0)
+        except Exception:
+            # fall back to fuzzy matching below
+            pass
+        todo = [i for i in todo if out[i] is None]
+
+    # exact label hits need no scoring
+    rest = []
+    for i in todo:
+        exact = index.label_index.get(norms[i].lower()) if norms[i] else None
+        if exact is None:
+            rest.append(i)
+        elif threshold <= 1.0:
+            out[i] = _predicate_result(index, exact, 1.0)
+    todo = rest
+
+    if not HAVE_RAPIDFUZZ:
+        for i in todo:
+            out[i] = map_predicate(phrases[i], threshold)
+    elif todo and index.human_labels_lower:
+        scores = score_matrix([norms[i].lower() for i in todo], index.human_labels_lower)
+        best = scores.argmax(axis=1)
+        for i, b, row in zip(todo, best.tolist(), scores):
+            sc = float(row[b])
+            if sc > 0 and sc >= threshold:
+                out[i] = _predicate_result(index, b, sc)
+    return out
+
+
+def _rank_candidates(norm: str, k: int, use_llm_flag: bool) -> tuple:
+    """Rank ontology predicates for the normalized phrase ``norm``.
+
+    Returns an immutable tuple of ``(pred_id, score, label, explanation,
+    backend)`` rows so results can be memoized and shared safely.
+    """
+    index = _ontology_index()
+    ont = index.ont
+
+    # If use_llm is requested, try to ask the optional llm chooser for
+    # a preferred ordering. This implementation will place the LLM's
+    # single choice first (if any) and then fall back to fuzzy ranking.
+    chosen_idx = None
+    if use_llm_flag:
+        try:
+            from cidsem import llm
+
             choice = llm.choose_predicate(norm, ont.get("predicates", []))
             if choice is not None:
                 if isinstance(choice, int):
-                    idx = choice
+                    chosen_idx = choice
                 else:
-                    # attempt to find the predicate dict in ontology list
                     try:
-                        idx = ont.get("predicates", []).index(choice)
+                        chosen_idx = ont.get("predicates", []).index(choice)
                     except ValueError:
-                        idx = None
-                if idx is not None:
-                    chosen = ont.get("predicates", [])[idx]
-                    result_pred = dict(chosen)
-                    result_pred["label"] = (
-                        result_pred.get("label") or result_pred.get("content") or ""
-                    )
-                    parts = result_pred["label"].split(":", 2)
-                    result_pred["label"] = (
-                        parts[2] if len(parts) == 3 else result_pred["label"]
-                    )
-                    return {"predicate": result_pred, "score": 1.0}
+                        chosen_idx = None
         except Exception:
-            # fall back to fuzzy matching below
-            pass
-    for p in ont.get("predicates", []):
-        # ontology labels are fully-qualified like 'kind:namespace:label...'
-        # Per spec the first two ':' split kind and namespace; everything after
-        # the second ':' is the human label (may contain colons). Extract that
-        # portion for fuzzy matching. The ontology file may use either 'label'
-        # or 'content' as the fully-qualified string, so accept both.
-        full_label = p.get("label") or p.get("content") or ""
-        parts = full_label.split(":", 2)
-        human_label = parts[2] if len(parts) == 3 else full_label
-        sc = _score(norm.lower(), human_label.lower())
-        if sc > best_score:
-            best_score = sc
-            best = p
-    if best_score >= threshold:
-        # Return a copy of the matched predicate with a normalized human
-        # 'label' field containing the extracted human_label so callers can
-        # rely on p['label'] regardless of the original ontology field name.
-        result_pred = dict(best)
-        # ensure label key exists and is the human readable portion
-        result_pred["label"] = (
-            result_pred.get("label") or result_pred.get("content") or ""
+            chosen_idx = None
+
+    query = norm.lower()
+    scored = [
+        (idx, score(query, lower), human_label)
+        for idx, (human_label, lower) in enumerate(
+            zip(index.human_labels, index.human_labels_lower)
         )
-        parts = result_pred["label"].split(":", 2)
-        result_pred["label"] = parts[2] if len(parts) == 3 else result_pred["label"]
-        return {"predicate": result_pred, "score": best_score}
-    return None
+    ]
+
+    # If an LLM chose an index, boost it to the top with score 1.0
+    if chosen_idx is not None:
+        for i, sc, human_label in scored:
+            if i == chosen_idx:
+                scored = [(i, 1.0, human_label)] + [s for s in scored if s[0] != i]
+                break
+
+    # Sort by score desc, deterministic tie-break by index
+    scored.sort(key=lambda x: (-x[1], x[0]))
+
+    # Normalize scores to [0,1] relative to top score (avoid division by 0)
+    if scored:
+        top_score = scored[0][1]
+        if top_score <= 0:
+            top_score = 1.0
+    else:
+        top_score = 1.0
+
+    return tuple(
+        (
+            # pred_id: prefer 'cid' if present, otherwise JSON-serialize entity
+            index.pred_ids[idx],
+            float(sc / top_score) if top_score else float(sc),
+            human_label,
+            f"fuzzy-match:{sc:.3f}",
+            "llm" if (use_llm_flag and idx == chosen_idx) else "rules",
+        )
+        for idx, sc, human_label in scored[:k]
+    )
+
+
+@lru_cache(maxsize=4096)
+def _rank_candidates_rules(norm: str, k: int, stamp) -> tuple:
+    # ``stamp`` is only part of the cache key, see _map_predicate_rules
+    return _rank_candidates(norm, k, False)
 
 
 def map_predicate_candidates(
@@ -135,102 +349,39 @@ def map_predicate_candidates(
     - backend: 'rules' or 'llm'
     - latency_ms: time taken to compute
 
-    The function is intentionally deterministic and cached for repeated
-    calls with the same normalized inputs.
+    The function is intentionally deterministic: rule-based rankings are
+    cached per normalized phrase for the current ontology file (subject,
+    object and context do not affect the ranking yet); LLM-assisted
+    rankings are always recomputed.
     """
 
     start = time.time()
-
-    # Prepare cache key components
-    subj_k = subject or ""
-    obj_k = object or ""
-    ctx_k = context or ""
-
-    @lru_cache(maxsize=4096)
-    def _inner_cached(key_phrase, key_subj, key_obj, key_ctx, k, use_llm_flag):
-        ont = load_ontology()
-        norm = normalize_predicate(key_phrase)
-
-        candidates = []
-
-        # If use_llm is requested, try to ask the optional llm chooser for
-        # a preferred ordering. This implementation will place the LLM's
-        # single choice first (if any) and then fall back to fuzzy ranking.
-        chosen_idx = None
-        if use_llm_flag:
-            try:
-                from cidsem import llm
-
-                choice = llm.choose_predicate(norm, ont.get("predicates", []))
-                if choice is not None:
-                    if isinstance(choice, int):
-                        chosen_idx = choice
-                    else:
-                        try:
-                            chosen_idx = ont.get("predicates", []).index(choice)
-                        except ValueError:
-                            chosen_idx = None
-            except Exception:
-                chosen_idx = None
-
-        scored = []
-        for idx, p in enumerate(ont.get("predicates", [])):
-            full_label = p.get("label") or p.get("content") or ""
-            parts = full_label.split(":", 2)
-            human_label = parts[2] if len(parts) == 3 else full_label
-            sc = _score(norm.lower(), human_label.lower())
-            scored.append((idx, sc, p, human_label))
-
-        # If an LLM chose an index, boost it to the top with score 1.0
-        if chosen_idx is not None:
-            for i, sc, p, human_label in scored:
-                if i == chosen_idx:
-                    scored = [(i, 1.0, p, human_label)] + [
-                        s for s in scored if s[0] != i
-                    ]
-                    break
-
-        # Sort by score desc, deterministic tie-break by index
-        scored.sort(key=lambda x: (-x[1], x[0]))
-
-        # Normalize scores to [0,1] relative to top score (avoid division by 0)
-        if scored:
-            top_score = scored[0][1]
-            if top_score <= 0:
-                top_score = 1.0
-        else:
-            top_score = 1.0
-
-        for rank, (idx, sc, p, human_label) in enumerate(scored[:k]):
-            # pred_id: prefer 'cid' if present, otherwise JSON-serialize entity
-            pcid = p.get("cid")
-            if pcid is None and isinstance(p.get("entity"), dict):
-                try:
-                    pcid = _json.dumps(p.get("entity"), sort_keys=True)
-                except Exception:
-                    pcid = str(p.get("entity"))
-            if not isinstance(pcid, str):
-                pcid = str(pcid)
-
-            normalized_score = float(sc / top_score) if top_score else float(sc)
-
-            candidates.append({
-                "pred_id": pcid,
-                "score": normalized_score,
-                "label": human_label,
-                "explanation": f"fuzzy-match:{sc:.3f}",
-                "backend": "llm" if (use_llm_flag and idx == chosen_idx) else "rules",
-            })
-
-        latency_ms = (time.time() - start) * 1000.0
-        # Attach latency to first candidate for visibility
-        if candidates:
-            candidates[0]["latency_ms"] = latency_ms
-
-        return tuple(_json.dumps(c, sort_keys=True) for c in candidates)
-
-    # Call cached inner function
-    raw = _inner_cached(phrase, subj_k, obj_k, ctx_k, top_k, use_llm)
-    # Convert back to dicts
-    out = [_json.loads(x) for x in raw]
+    norm = normalize_predicate(phrase)
+    if use_llm:
+        rows = _rank_candidates(norm, top_k, True)
+    else:
+        rows = _rank_candidates_rules(norm, top_k, _ontology_stamp())
+
+    # keys in sorted order, as the candidates have always been emitted
+    out = [
+        {
+            "backend": backend,
+            "explanation": explanation,
+            "label": label,
+            "pred_id": pred_id,
+            "score": score,
+        }
+        for pred_id, score, label, explanation, backend in rows
+    ]
+    # Attach latency to first candidate for visibility
+    if out:
+        first = out[0]
+        out[0] = {
+            "backend": first["backend"],
+            "explanation": first["explanation"],
+            "label": first["label"],
+            "latency_ms": (time.time() - start) * 1000.0,
+            "pred_id": first["pred_id"],
+            "score": first["score"],
+        }
     return out
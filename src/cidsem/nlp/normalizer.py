@@ -12,19 +12,31 @@ _RULES: List[tuple] = [
     (re.compile(r"\bworks(?:\s+as)?\b", re.I), "works as"),
 ]
 
+# All rules fused into one anchored pattern: each alternative is a lookahead
+# for one rule, tried in _RULES order, so the first rule that matches
+# anywhere still wins. The empty group names the replacement via lastgroup.
+_MASTER = re.compile(
+    "^(?:"
+    + "|".join(rf"(?=.*?{rx.pattern})(?P<r{i}>)" for i, (rx, _) in enumerate(_RULES))
+    + ")",
+    re.I | re.S,
+)
+_REPL = {f"r{i}": repl for i, (_, repl) in enumerate(_RULES)}
+
+# punctuation and whitespace runs collapse to a single space in one pass
+_CLEAN = re.compile(r"[^a-z0-9]+")
+
 
 def normalize_predicate(phrase: str) -> str:
     """Apply simple rewrite rules to produce a canonical predicate phrase."""
     p = phrase.strip().lower()
     if not p:
         return p
-    # remove punctuation
-    p = re.sub(r"[^a-z0-9\s]", " ", p)
-    p = re.sub(r"\s+", " ", p).strip()
+    p = _CLEAN.sub(" ", p).strip()
 
-    for rx, repl in _RULES:
-        if rx.search(p):
-            return repl
+    m = _MASTER.match(p)
+    if m:
+        return _REPL[m.lastgroup]
 
     # fallback: return cleaned phrase
     return p
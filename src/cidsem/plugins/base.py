@@ -156,31 +156,41 @@ class DataStructurePlugin(ABC):
         # Derived classes should restore actual data
 
 
+_MISSING = object()
+
+
 class DefaultDataStructure(DataStructurePlugin):
     """
     Default in-memory plugin for predicates without specialized requirements.
 
     Simple dict-based storage. Suitable for small to medium predicates where
     specialized indices aren't needed.
+
+    Updates never await, so they are atomic with respect to other coroutines
+    and take no lock; the ``*_sync`` variants serve non-async callers.
     """
 
     def __init__(self):
         super().__init__()
         self.data = {}  # subject -> object
 
+    def get_sync(self, subject: str) -> Any:
+        return self.data.get(subject)
+
+    def set_sync(self, subject: str, object_value: Any):
+        self.data[subject] = object_value
+
+    def delete_sync(self, subject: str) -> bool:
+        return self.data.pop(subject, _MISSING) is not _MISSING
+
     async def get(self, subject: str) -> Any:
         return self.data.get(subject)
 
     async def set(self, subject: str, object_value: Any):
-        async with self._lock:
-            self.data[subject] = object_value
+        self.data[subject] = object_value
 
     async def delete(self, subject: str) -> bool:
-        async with self._lock:
-            if subject in self.data:
-                del self.data[subject]
-                return True
-            return False
+        return self.delete_sync(subject)
 
     async def snapshot(self) -> dict:
         base = await super().snapshot()
@@ -5,10 +5,10 @@ Optimized for numeric predicates that need efficient reverse lookups and
 range queries (e.g., hasApple, hasAge, hasPrice).
 """
 
-import asyncio
-from typing import Any, List, Optional
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
-from sortedcontainers import SortedDict
+from sortedcontainers import SortedList
 
 from .base import DataStructurePlugin, QueryCapability
 
@@ -19,16 +19,32 @@ class NumericRangeDS(DataStructurePlugin):
 
     Maintains two indices:
     1. subject -> value (primary, for SPO queries)
-    2. value -> set(subjects) (reverse, for POS and range queries)
+    2. value -> set(subject ids) (reverse, for POS and range queries)
+
+    Subjects are interned to small ints for the reverse index, so each
+    subject string is stored once no matter how often it is re-indexed;
+    a deleted subject's id is freed and reused by the next new subject.
 
     Suitable for: counts, quantities, ages, prices, ratings, etc.
+
+    Updates never await, so they are atomic with respect to other coroutines
+    and take no lock; the ``*_sync`` variants serve non-async callers.
     """
 
     def __init__(self):
         super().__init__()
         self.data = {}  # subject -> value
-        self.range_index = SortedDict()  # value -> set(subjects)
-        self._update_lock = asyncio.Lock()  # Prevent race conditions on updates
+        # subject interning: id -> subject and subject -> id
+        self._subjects: List[Optional[str]] = []
+        self._subject_ids: Dict[str, int] = {}
+        self._free_sids: List[int] = []  # ids of deleted subjects, for reuse
+        # value -> set(subject ids); a plain dict keeps exact-value lookups at
+        # C-level hash speed, and only the distinct values are kept sorted
+        self.range_index = {}
+        self._sorted_values = SortedList()
+        # Flat (sorted values, subjects) columns for range scans, rebuilt
+        # lazily from range_index on the first range query after a write
+        self._range_columns: Optional[Tuple[List[Any], List[str]]] = None
 
     def configure(self, config: dict):
         super().configure(config)
@@ -52,10 +68,19 @@ class NumericRangeDS(DataStructurePlugin):
             QueryCapability.RANGE,
         ]
 
+    def get_sync(self, subject: str) -> Optional[int]:
+        return self.data.get(subject)
+
     async def get(self, subject: str) -> Optional[int]:
         return self.data.get(subject)
 
     async def set(self, subject: str, object_value: Any):
+        self.set_sync(subject, object_value)
+
+    async def delete(self, subject: str) -> bool:
+        return self.delete_sync(subject)
+
+    def set_sync(self, subject: str, object_value: Any):
         # Validate numeric value
         if not isinstance(object_value, (int, float)):
             raise TypeError(
@@ -68,36 +93,55 @@ class NumericRangeDS(DataStructurePlugin):
         if self.max_value is not None and object_value > self.max_value:
             raise ValueError(f"Value {object_value} above maximum {self.max_value}")
 
-        async with self._update_lock:
-            # Remove old value from reverse index
-            old_value = self.data.get(subject)
-            if old_value is not None and old_value in self.range_index:
-                self.range_index[old_value].discard(subject)
-                if not self.range_index[old_value]:
-                    del self.range_index[old_value]
-
-            # Add new value to both indices
-            self.data[subject] = object_value
-
-            if object_value not in self.range_index:
-                self.range_index[object_value] = set()
-            self.range_index[object_value].add(subject)
-
-    async def delete(self, subject: str) -> bool:
-        async with self._update_lock:
-            old_value = self.data.get(subject)
-            if old_value is None:
-                return False
-
-            # Remove from both indices
-            del self.data[subject]
-
-            if old_value in self.range_index:
-                self.range_index[old_value].discard(subject)
-                if not self.range_index[old_value]:
-                    del self.range_index[old_value]
-
-            return True
+        self._range_columns = None
+        sid = self._intern(subject)
+        # Remove old value from reverse index
+        old_value = self.data.get(subject)
+        if old_value is not None:
+            self._unindex(sid, old_value)
+
+        # Add new value to both indices
+        self.data[subject] = object_value
+
+        subjects = self.range_index.get(object_value)
+        if subjects is None:
+            subjects = self.range_index[object_value] = set()
+            self._sorted_values.add(object_value)
+        subjects.add(sid)
+
+    def delete_sync(self, subject: str) -> bool:
+        old_value = self.data.get(subject)
+        if old_value is None:
+            return False
+
+        # Remove from both indices
+        del self.data[subject]
+        self._range_columns = None
+        sid = self._subject_ids.pop(subject)
+        self._unindex(sid, old_value)
+        self._subjects[sid] = None
+        self._free_sids.append(sid)
+        return True
+
+    def _intern(self, subject: str) -> int:
+        sid = self._subject_ids.get(subject)
+        if sid is None:
+            if self._free_sids:
+                sid = self._free_sids.pop()
+                self._subjects[sid] = subject
+            else:
+                sid = len(self._subjects)
+                self._subjects.append(subject)
+            self._subject_ids[subject] = sid
+        return sid
+
+    def _unindex(self, sid: int, value: Any) -> None:
+        subjects = self.range_index.get(value)
+        if subjects is not None:
+            subjects.discard(sid)
+            if not subjects:
+                del self.range_index[value]
+                self._sorted_values.remove(value)
 
     async def contains(self, subject: str, object_value: Any) -> bool:
         # Optimized OSP: direct dictionary lookup (O(1))
@@ -105,25 +149,50 @@ class NumericRangeDS(DataStructurePlugin):
 
     async def find_subjects(self, object_value: Any) -> List[str]:
         # Optimized POS: use range index (O(1) for exact match)
-        subjects = self.range_index.get(object_value, set())
-        return list(subjects)
+        names = self._subjects
+        return [names[sid] for sid in self.range_index.get(object_value, ())]
+
+    async def find_subjects_set(self, object_value: Any) -> FrozenSet[str]:
+        """Like ``find_subjects``, as a frozenset for order-free comparisons."""
+        names = self._subjects
+        return frozenset([names[sid] for sid in self.range_index.get(object_value, ())])
+
+    def _reverse_view(self) -> Dict[Any, Set[str]]:
+        """Return the reverse index as value -> set(subjects), in one sync call.
+
+        A fresh dict each time; mutating it does not touch the plugin.
+        """
+        names = self._subjects
+        return {
+            value: {names[sid] for sid in sids}
+            for value, sids in self.range_index.items()
+        }
 
     async def find_subjects_in_range(self, min_val: float, max_val: float) -> List[str]:
         """
         Range query: Find all subjects with values in [min_val, max_val].
 
-        Uses SortedDict for efficient range iteration.
+        Binary-searches the flat value column and returns one slice of the
+        parallel subject column.
         """
         if min_val > max_val:
             raise ValueError(f"min_val ({min_val}) must be <= max_val ({max_val})")
 
-        results = []
-
-        # SortedDict.irange() efficiently iterates values in range
-        for value in self.range_index.irange(min_val, max_val):
-            results.extend(self.range_index[value])
-
-        return results
+        columns = self._range_columns
+        if columns is None:
+            columns = self._range_columns = self._build_range_columns()
+        values, subjects = columns
+        return subjects[bisect_left(values, min_val) : bisect_right(values, max_val)]
+
+    def _build_range_columns(self) -> Tuple[List[Any], List[str]]:
+        names = self._subjects
+        values: List[Any] = []
+        subjects: List[str] = []
+        for value in self._sorted_values:
+            sids = self.range_index[value]
+            values.extend([value] * len(sids))
+            subjects.extend([names[sid] for sid in sids])
+        return values, subjects
 
     async def health_check(self) -> dict:
         base = await super().health_check()
@@ -140,10 +209,10 @@ class NumericRangeDS(DataStructurePlugin):
         base = await super().snapshot()
         base["data"] = {
             "subjects": dict(self.data),
-            # Serialize range_index (SortedDict -> dict, sets -> lists)
+            # Serialize range_index in value order (id sets -> subject lists)
             "range_index": {
-                str(value): list(subjects)
-                for value, subjects in self.range_index.items()
+                str(value): [self._subjects[sid] for sid in self.range_index[value]]
+                for value in self._sorted_values
             },
         }
         return base
@@ -155,7 +224,12 @@ class NumericRangeDS(DataStructurePlugin):
         self.data = dict(data.get("subjects", {}))
 
         # Restore range_index
-        self.range_index = SortedDict()
+        self._subjects = []
+        self._subject_ids = {}
+        self._free_sids = []
+        self.range_index = {}
+        self._range_columns = None
         for value_str, subjects_list in data.get("range_index", {}).items():
             value = float(value_str)
-            self.range_index[value] = set(subjects_list)
+            self.range_index[value] = {self._intern(subj) for subj in subjects_list}
+        self._sorted_values = SortedList(self.range_index)
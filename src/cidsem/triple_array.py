@@ -0,0 +1,93 @@
+"""triple_array.py - columnar storage for bulk triples
+
+`TripleArray` keeps N triples in one NumPy structured array (subject,
+predicate and object as four uint64 lanes each, plus `created_at`) instead
+of N `TripleRecord` objects. Bulk paths such as
+`CidstoreClient.batch_insert_triples` read the lane columns directly;
+single items are materialized as `TripleRecord` on access.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .keys import E
+
+# lanes are stored high, high_mid, low_mid, low
+DTYPE = np.dtype([
+    ("s", "<u8", 4),
+    ("p", "<u8", 4),
+    ("o", "<u8", 4),
+    ("created_at", "<f8"),
+])
+
+
+class TripleArray:
+    """A fixed-size, columnar batch of triples."""
+
+    __slots__ = ("buf", "provenance", "schema_version")
+
+    def __init__(self, n: int, schema_version: str = "v1"):
+        self.buf: NDArray[np.void] = np.zeros(n, DTYPE)
+        self.provenance: List[Optional[Dict[str, Any]]] = [None] * n
+        self.schema_version = schema_version
+
+    @classmethod
+    def from_records(cls, records: Iterable) -> TripleArray:
+        """Fill a TripleArray from TripleRecords in one vectorized pass."""
+        records = list(records)
+        n = len(records)
+        arr = cls(n)
+        # each E is its big-endian lanes as one 256-bit int
+        buf = b"".join(
+            int(e).to_bytes(32, "big")
+            for r in records
+            for e in (r.subject, r.predicate, r.object)
+        )
+        spo = np.frombuffer(buf, dtype=">u8").reshape(n, 3, 4)
+        arr.buf["s"] = spo[:, 0]
+        arr.buf["p"] = spo[:, 1]
+        arr.buf["o"] = spo[:, 2]
+        arr.buf["created_at"] = [r.created_at for r in records]
+        arr.provenance = [r.provenance for r in records]
+        if records:
+            arr.schema_version = records[0].schema_version
+        return arr
+
+    def lanes(self) -> tuple[NDArray[np.uint64], NDArray[np.uint64], NDArray[np.uint64]]:
+        """Return subject, predicate and object lanes as ``uint64[N, 4]`` arrays."""
+        return self.buf["s"], self.buf["p"], self.buf["o"]
+
+    def to_record(self, i: int):
+        """Materialize triple ``i`` as a TripleRecord."""
+        from .cidstore import TripleRecord
+
+        row = self.buf[i]
+        record = TripleRecord(
+            _e_from_lanes(row["s"]),
+            _e_from_lanes(row["p"]),
+            _e_from_lanes(row["o"]),
+            self.provenance[i],
+            self.schema_version,
+            float(row["created_at"]),
+        )
+        # share the provenance dict so hashes attached later stay visible here
+        self.provenance[i] = record.provenance
+        return record
+
+    def __len__(self) -> int:
+        return len(self.buf)
+
+    def __getitem__(self, i: int):
+        return self.to_record(i)
+
+    def __iter__(self) -> Iterator:
+        for i in range(len(self.buf)):
+            yield self.to_record(i)
+
+
+def _e_from_lanes(lanes) -> E:
+    return E(int.from_bytes(lanes.astype(">u8").tobytes(), "big"))
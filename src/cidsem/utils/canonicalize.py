@@ -1,19 +1,97 @@
 import json
+import os
 from hashlib import blake2b
+from typing import List, Sequence
+
+import orjson
+
+# CIDs are 128-bit digests of the canonical JSON. CIDSEM_CID_HASH=blake3
+# switches from BLAKE2b to the faster BLAKE3 (optional ``blake3`` package);
+# the CIDs differ between the two, so keep one setting per store.
+CID_HASH = os.getenv("CIDSEM_CID_HASH", "blake2b")
+if CID_HASH == "blake3":
+    try:
+        from blake3 import blake3
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        # no silent fallback: mixing algorithms would give the same factoid
+        # different cids
+        raise ImportError("CIDSEM_CID_HASH=blake3 requires the blake3 package") from exc
+
+    def _digest_hex(data: bytes) -> str:
+        return blake3(data).hexdigest(length=16)
+
+elif CID_HASH == "blake2b":
+
+    def _digest_hex(data: bytes) -> str:
+        return blake2b(data, digest_size=16).hexdigest()
+
+else:
+    raise ValueError(f"unsupported CIDSEM_CID_HASH: {CID_HASH!r}")
+
+
+def _orjson_safe_float(x: float) -> bool:
+    # repr (and so the stdlib) switches to exponent form outside this range,
+    # where orjson spells it differently (1e16 vs 1e+16, 0.00001 vs 1e-05);
+    # NaN and +-inf fail the comparison too (orjson writes them as null)
+    return x == 0 or 1e-4 <= abs(x) < 1e16
+
+
+def _has_unsafe_float(obj) -> bool:
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, float):
+            if not _orjson_safe_float(o):
+                return True
+        elif isinstance(o, dict):
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple)):
+            stack.extend(o)
+    return False
+
+
+def canonicalize_json_bytes(obj) -> bytes:
+    """UTF-8 canonical JSON: compact separators, sorted keys, no ASCII escaping."""
+    if not _has_unsafe_float(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # orjson rejects what the stdlib coerces (non-str keys, >64-bit ints)
+            pass
+    return json.dumps(
+        obj, separators=(",", ":"), sort_keys=True, ensure_ascii=False
+    ).encode("utf-8")
 
 
 def canonicalize_json(obj) -> str:
     """Canonicalize JSON following a simplified deterministic ordering (keys sorted)."""
-    return json.dumps(obj, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+    return canonicalize_json_bytes(obj).decode("utf-8")
 
 
-def cid_from_canonical(json_str: str) -> str:
-    # Use blake2b 16-byte digest (128-bit) encoded as hex
-    h = blake2b(digest_size=16)
-    h.update(json_str.encode("utf-8"))
-    return h.hexdigest()
+def cid_from_canonical(data: bytes | str) -> str:
+    # 16-byte digest (128-bit) encoded as hex
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return _digest_hex(data)
 
 
 def canonical_cid(obj) -> str:
-    s = canonicalize_json(obj)
-    return cid_from_canonical(s)
+    return cid_from_canonical(canonicalize_json_bytes(obj))
+
+
+def canonical_cids(objs: Sequence) -> List[str]:
+    """Return ``canonical_cid`` for each object, ``""`` where one cannot be computed."""
+    dumps = canonicalize_json_bytes
+    digest = _digest_hex
+    try:
+        return [digest(dumps(obj)) for obj in objs]
+    except Exception:
+        pass
+    # some object failed; redo per item so only that one loses its cid
+    cids: List[str] = []
+    for obj in objs:
+        try:
+            cids.append(digest(dumps(obj)))
+        except Exception:
+            cids.append("")
+    return cids
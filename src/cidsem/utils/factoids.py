@@ -1,7 +1,9 @@
 import re
 from typing import Dict, List, Tuple
 
-from cidsem.utils.canonicalize import canonical_cid
+from cidsem.utils.canonicalize import canonical_cids
+
+_YEAR_RE = re.compile(r"\b(1[0-9]{3}|20[0-9]{2})\b")
 
 
 def build_factoids(
@@ -14,59 +16,46 @@ def build_factoids(
     Also produces simple secondary factoids for years mentioned in the text, referencing the first
     main factoid ID.
     """
-    factoids: List[Dict] = []
-    # main factoids from triples
-    for i, (subj, pred, obj) in enumerate(triples, start=1):
-        fid = f"{input_id}F{i:02d}"
-        text_repr = " ".join(filter(None, [subj, pred, obj])).strip()
-        f = {
-            "id": fid,
+    # the cid covers every field except the id; collect those dicts first and
+    # hash them in one batch
+    contents: List[Dict] = []
+    for subj, pred, obj in triples:
+        if subj and pred and obj:
+            # the usual case; same result as the join below
+            text_repr = f"{subj} {pred} {obj}".strip()
+        else:
+            text_repr = " ".join(filter(None, (subj, pred, obj))).strip()
+        contents.append({
             "input_id": input_id,
             "subject": subj,
             "predicate": pred,
             "object": obj,
             "text": text_repr,
-        }
-        # compute deterministic cid for the factoid
-        try:
-            f["cid"] = canonical_cid({
-                k: f[k] for k in ("input_id", "subject", "predicate", "object", "text")
-            })
-        except Exception:
-            # fallback: omit cid on error
-            f["cid"] = ""
-        factoids.append(f)
+        })
+    ids = [f"{input_id}F{i:02d}" for i in range(1, len(contents) + 1)]
 
     # secondary factoids: years mentioned in the original text
-    years = re.findall(r"\b(1[0-9]{3}|20[0-9]{2})\b", text)
-    # de-duplicate while preserving order
-    seen = set()
-    years_unique = []
-    for y in years:
-        if y not in seen:
-            seen.add(y)
-            years_unique.append(y)
+    # (de-duplicated while preserving order)
+    years_unique = list(dict.fromkeys(_YEAR_RE.findall(text)))
 
-    if years_unique and factoids:
+    if years_unique and contents:
         # attach year facts referencing the first main factoid
-        main_id = factoids[0]["id"]
+        main_id = ids[0]
         for j, y in enumerate(years_unique, start=1):
-            fid = f"{input_id}F{len(factoids) + j:02d}"
-            f = {
-                "id": fid,
+            # numbered from the running factoid count, as ids were assigned
+            # historically (stable ids matter more than gap-free ones)
+            ids.append(f"{input_id}F{len(ids) + j:02d}")
+            contents.append({
                 "input_id": input_id,
                 "subject": "",
                 "predicate": "happened",
                 "object": y,
                 "text": f"{main_id} happened {y}",
-            }
-            try:
-                f["cid"] = canonical_cid({
-                    k: f[k]
-                    for k in ("input_id", "subject", "predicate", "object", "text")
-                })
-            except Exception:
-                f["cid"] = ""
-            factoids.append(f)
+            })
 
-    return factoids
+    # a factoid whose cid cannot be computed gets an empty cid
+    cids = canonical_cids(contents)
+    return [
+        {"id": fid, **content, "cid": cid}
+        for fid, content, cid in zip(ids, contents, cids)
+    ]
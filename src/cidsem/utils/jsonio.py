@@ -0,0 +1,23 @@
+import mmap
+from pathlib import Path
+
+import orjson
+
+
+def load_json_file(path) -> object:
+    """Parse a JSON file straight from a read-only memory map.
+
+    orjson accepts bytes-like input, so the file is never decoded into an
+    intermediate ``str`` nor copied into a ``bytes`` object first.
+    """
+    with open(Path(path), "rb") as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped; let orjson report the error
+            return orjson.loads(b"")
+        try:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+        finally:
+            mm.close()
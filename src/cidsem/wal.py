@@ -1,38 +1,257 @@
-import json
+import asyncio
+import mmap
 import os
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional
+
+import orjson
+
+# writev rejects more buffers than this per call (EINVAL)
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):  # e.g. Windows
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
 
 
 class WAL:
     """Simple append-only WAL using JSON lines.
 
     Each record is a JSON object and will be appended with a newline.
+    With ``fsync=True`` every append (or batch) is also synced to stable
+    storage before returning; otherwise it is only flushed to the OS.
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, fsync: bool = False):
         self.path = path
+        self.fsync = fsync
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        # ensure file exists
-        open(self.path, "a", encoding="utf-8").close()
+        # idempotency_key -> byte offset of the first record carrying it, and
+        # the offset up to which the file has been indexed
+        self._idem_index: Dict[str, int] = {}
+        self._end = 0
+        self._build_index()
+        # keep one append handle for the lifetime of the WAL (this also
+        # creates the file) instead of re-opening it for every record
+        self._fh = open(self.path, "ab", buffering=1 << 16)
+        # records queued by append_async, flushed together by _flush_pending
+        self._pending: Optional[list] = None
+        self._pending_keys: Optional[list] = None
+        self._pending_done: Optional[asyncio.Future] = None
+        # idempotency_key -> first queued record carrying it, so duplicate
+        # checks see records before their batch reaches the file
+        self._pending_by_key: Dict[str, bytes] = {}
+
+    def _build_index(self) -> None:
+        self._idem_index = {}
+        self._end = 0
+        self._index_tail()
+
+    def _index_tail(self) -> None:
+        """Index the records past ``_end``, whoever appended them.
+
+        Other WAL instances or processes may append to the same file, so the
+        index is brought up to date from the file itself; a file that shrank
+        was rewritten and is indexed again from the start.
+        """
+        try:
+            size = os.stat(self.path).st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self._end:
+            self._idem_index = {}
+            self._end = 0
+        if size == self._end:
+            return
+        start = offset = self._end
+        index = self._idem_index
+        try:
+            for line in self._lines(start):
+                if not line.endswith(b"\n"):
+                    # a record still being written; index it next time
+                    break
+                # only parse lines that can carry a key
+                if b'"idempotency_key"' in line:
+                    key = _idem_key(orjson.loads(line))
+                    if key is not None:
+                        index.setdefault(key, offset)
+                offset += len(line)
+        except orjson.JSONDecodeError:
+            if start == 0:
+                raise
+            # _end no longer falls on a record boundary: start over
+            self._build_index()
+            return
+        self._end = offset
+
+    def _note_written(self, bufs: List[bytes], keys: List[Optional[str]]) -> None:
+        # with O_APPEND the fd's offset ends exactly after our own write, even
+        # if others appended in between, so the batch started len(batch) ago
+        end = os.lseek(self._fh.fileno(), 0, os.SEEK_CUR)
+        start = end - sum(map(len, bufs))
+        if start != self._end:
+            # someone else wrote since our last look; index from the file
+            self._index_tail()
+            return
+        index = self._idem_index
+        offset = start
+        for buf, key in zip(bufs, keys):
+            if key is not None and key not in index:
+                index[key] = offset
+            offset += len(buf)
+        self._end = end
 
     def append(self, record: dict) -> None:
-        with open(self.path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # one write per record; flush so readers see it immediately
+        buf = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        self._fh.write(buf)
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+        self._note_written([buf], [_idem_key(record)])
+
+    def append_batch(self, records) -> None:
+        """Append several records with one write (and at most one fsync)."""
+        records = list(records)
+        bufs = [orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in records]
+        if bufs:
+            self._write_many(bufs)
+            self._note_written(bufs, [_idem_key(r) for r in records])
+
+    async def append_async(self, record: dict) -> None:
+        """Append ``record`` without a write syscall per call.
+
+        Records submitted during the same event-loop iteration are collected
+        and written together with one vectored write; each caller resumes once
+        the batch containing its record is on disk. The record's idempotency
+        key is visible to ``find_by_idempotency_key`` as soon as this is
+        called, before the batch is written.
+        """
+        loop = asyncio.get_running_loop()
+        if self._pending is None:
+            self._pending = []
+            self._pending_keys = []
+            self._pending_done = loop.create_future()
+            loop.call_soon(self._flush_pending)
+        buf = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        key = _idem_key(record)
+        self._pending.append(buf)
+        self._pending_keys.append(key)
+        if key is not None:
+            self._pending_by_key.setdefault(key, buf)
+        # shield: a cancelled caller must not cancel the batch for the others
+        await asyncio.shield(self._pending_done)
+
+    def _flush_pending(self) -> None:
+        bufs, keys, done = self._pending, self._pending_keys, self._pending_done
+        self._pending = self._pending_keys = self._pending_done = None
+        # written (or failed) synchronously below, so no caller can look the
+        # keys up in between
+        self._pending_by_key = {}
+        try:
+            self._write_many(bufs)
+        except Exception as e:
+            done.set_exception(e)
+        else:
+            self._note_written(bufs, keys)
+            done.set_result(None)
+
+    def _write_many(self, bufs: list) -> None:
+        if not hasattr(os, "writev"):  # e.g. Windows
+            self._fh.write(b"".join(bufs))
+            self._fh.flush()
+        else:
+            self._fh.flush()
+            fd = self._fh.fileno()
+            # writev may write only part of the batch; resume where it stopped
+            # (bufs itself is left untouched; skip counts bytes of bufs[i]
+            # already written)
+            i, skip, count = 0, 0, len(bufs)
+            while i < count:
+                chunk = bufs[i : i + _IOV_MAX]
+                if skip:
+                    chunk[0] = chunk[0][skip:]
+                n = skip + os.writev(fd, chunk)
+                while i < count and n >= len(bufs[i]):
+                    n -= len(bufs[i])
+                    i += 1
+                skip = n
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.flush()
+            self._fh.close()
+
+    def __enter__(self) -> "WAL":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _lines(self, start: int = 0):
+        """Yield the raw lines of the log (including newlines) from a memory map.
+
+        Iteration begins at byte ``start``; only the part of the file that
+        exists when iteration starts is seen.
+        """
+        with open(self.path, "rb") as fh:
+            try:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty files cannot be mapped
+                return
+        try:
+            mm.seek(start)
+            yield from iter(mm.readline, b"")
+        finally:
+            mm.close()
 
     def read_all(self):
-        with open(self.path, "r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                yield json.loads(line)
+        for line in self._lines():
+            # orjson parses bytes and tolerates the trailing newline
+            if line.strip():
+                yield orjson.loads(line)
 
     def find_by_idempotency_key(self, key: str) -> Optional[dict]:
-        for rec in self.read_all():
-            if rec.get("idempotency_key") == key:
-                return rec
-        return None
+        if not isinstance(key, str):
+            for rec in self.read_all():
+                if rec.get("idempotency_key") == key:
+                    return rec
+            return None
+        if key not in self._idem_index:
+            # not seen yet; another WAL or process may have appended it
+            self._index_tail()
+            if key not in self._idem_index:
+                # or it is queued by append_async but not yet written
+                buf = self._pending_by_key.get(key)
+                return None if buf is None else orjson.loads(buf)
+        rec = self._read_indexed(key)
+        if rec is None or _idem_key(rec) != key:
+            # the file was rewritten behind our back, leaving the offset
+            # stale; rebuild the index from disk and retry once
+            self._build_index()
+            rec = self._read_indexed(key)
+        return rec
+
+    def _read_indexed(self, key: str) -> Optional[dict]:
+        """Return the record at ``key``'s offset, or None if it does not parse."""
+        offset = self._idem_index.get(key)
+        if offset is None:
+            return None
+        with open(self.path, "rb") as fh:
+            fh.seek(offset)
+            try:
+                return orjson.loads(fh.readline())
+            except orjson.JSONDecodeError:
+                return None
 
     def replay(self, handler: Callable[[dict], None]) -> None:
         for rec in self.read_all():
             handler(rec)
+
+
+def _idem_key(record: dict) -> Optional[str]:
+    key = record.get("idempotency_key")
+    return key if isinstance(key, str) else None
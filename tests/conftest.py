@@ -1,5 +1,7 @@
 import os
 import sys
+from functools import lru_cache
+from pathlib import Path
 
 # Ensure src is on sys.path for package imports during tests
 ROOT = os.path.dirname(os.path.dirname(__file__))
@@ -14,25 +16,39 @@ except ImportError:
     EClass = None
 
 
+import orjson
 import pytest
 
+# The api tests need FastAPI; skip those modules at collection time if it is
+# not installed instead of letting each one fail on import.
+try:
+    import fastapi  # noqa: F401
+except ImportError:
+    collect_ignore_glob = ["test_api_*.py"]
+
 
 class InMemoryCidstore:
     """A tiny in-memory cidstore-like client for tests.
 
     - Supports insert(key, value), batch_insert(items), lookup(key), delete(key, value=None)
     - Keys/values may be dicts with 'high'/'low' fields, tuples, ints, or strings; they are
-      normalized to tuples for internal storage.
+      normalized to tuples for internal storage. lookup() returns E values as
+      the E objects that were inserted and everything else as tuples.
     - batch_insert accepts a list of (key, value) tuples or a list of dicts {'key':..., 'value':...}.
     """
 
     def __init__(self):
-        self._store = {}  # key_tuple -> set of value_tuples
+        # key_tuple -> {value_tuple: stored value}; the inner dict doubles as
+        # an insertion-ordered set, keeping lookup() output stable across runs
+        self._store = {}
 
     def _norm(self, x):
         # normalize common shapes to a tuple for dict-keying
         if x is None:
             return None
+        # hot path: real E values split into their four lanes in one call
+        if EClass is not None and isinstance(x, EClass):
+            return x.parts()
         if isinstance(x, tuple):
             # Expect 4-tuple for greenfield design
             if len(x) == 4:
@@ -65,13 +81,17 @@ class InMemoryCidstore:
         if isinstance(x, (int, str)):
             return (str(x),)
 
-        # fallback: represent other forms as repr
-        return (repr(x),)
+        # anything else is a bug in the caller; a repr key would hide it
+        raise AssertionError(f"cannot normalize {type(x).__name__} key/value")
 
     def insert(self, key, value):
         k = self._norm(key)
         v = self._norm(value)
-        self._store.setdefault(k, set()).add(v)
+        # E values are kept as given so lookup() hands them back unconverted;
+        # every other shape is stored in its normalized tuple form
+        if EClass is None or not isinstance(value, EClass):
+            value = v
+        self._store.setdefault(k, {}).setdefault(v, value)
         return True
 
     def batch_insert(self, items):
@@ -87,8 +107,8 @@ class InMemoryCidstore:
 
     def lookup(self, key):
         k = self._norm(key)
-        vals = self._store.get(k, set())
-        return list(vals)
+        values = self._store.get(k)
+        return list(values.values()) if values else []
 
     def delete(self, key, value=None):
         k = self._norm(key)
@@ -98,18 +118,143 @@ class InMemoryCidstore:
             del self._store[k]
             return True
         v = self._norm(value)
-        if v in self._store[k]:
-            self._store[k].remove(v)
-            if not self._store[k]:
+        values = self._store[k]
+        if v in values:
+            del values[v]
+            if not values:
                 del self._store[k]
             return True
         return False
 
+    def clear(self):
+        """Drop all stored entries (used to reset the shared test client)."""
+        self._store.clear()
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def cidstore_client():
-    """Provide a fresh in-memory cidstore client for tests.
+    """Provide an in-memory cidstore client for tests.
 
+    One instance is shared by the whole session and emptied after every test,
+    so each test still starts from an empty store.
     Tests may use this fixture directly or monkeypatch application code to use it.
     """
     return InMemoryCidstore()
+
+
+@pytest.fixture(autouse=True)
+def _reset_cidstore(cidstore_client):
+    yield
+    cidstore_client.clear()
+
+
+@pytest.fixture(scope="session")
+def api_client():
+    """One FastAPI TestClient for the cidsem app, shared by all api tests."""
+    from fastapi.testclient import TestClient
+
+    from cidsem.api.app import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+# Request bodies shared by the api tests, serialized once; posted as raw JSON
+# bytes.
+@pytest.fixture(scope="session")
+def backlog_bytes():
+    return orjson.dumps(
+        {
+            "item_id": "bi-1",
+            "factoid_id": "f-1",
+            "priority": "normal",
+            "created_at": "2025-09-27T12:00:00Z",
+            "attempts": 0,
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def candidate_bytes():
+    return orjson.dumps(
+        {
+            "factoid_id": "f-1",
+            "factoid_text": "John joined Acme as CTO in 2019.",
+            "predicate_candidates": [
+                {"predicate_cid": "cid:pred:joined:v1", "score": 0.98}
+            ],
+            "provenance": {"msg_cid": "bafy", "chunk_id": "c-1"},
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def validation_bytes():
+    return orjson.dumps(
+        {
+            "event_id": "ev-1",
+            "factoid_id": "f-1",
+            "responder_id": "r-1",
+            "response": "confirmed",
+            "timestamp": "2025-09-27T12:00:00Z",
+            "bot_id": "bot-1",
+            "prompt_hash": "ph-123",
+            "model_version": "gpt-test-0",
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def e_of(s: str):
+    """Memoized ``E.from_str``; tests derive the same few entities over and over."""
+    return EClass.from_str(s)
+
+
+@pytest.fixture(scope="session")
+def e():
+    """Provide the memoized ``E.from_str`` helper as ``e("Alice")``."""
+    return e_of
+
+
+def load_json_file(path):
+    """Parse the JSON file at ``path`` with orjson from a single read."""
+    return orjson.loads(Path(path).read_bytes())
+
+
+@pytest.fixture(scope="session")
+def load_json():
+    """Provide ``load_json_file`` for reading fixture and schema files."""
+    return load_json_file
+
+
+@pytest.fixture
+def ontology_file(tmp_path, monkeypatch):
+    """Point the mapper at ``tmp_path/ontology.json`` and return that path.
+
+    The mapper looks ``ONTO_FILE`` up on every call and keys its caches on
+    (path, mtime), so each test's ontology is cached separately.
+    """
+    from cidsem.nlp import mapper
+
+    path = tmp_path / "ontology.json"
+    monkeypatch.setattr(mapper, "ONTO_FILE", str(path))
+    return path
+
+
+@pytest.fixture
+def wal_path(tmp_path, monkeypatch):
+    """Point the api's WAL (``CIDSEM_WAL``) at a fresh file for this test.
+
+    The app reads the variable per request, so tests stay independent and
+    can run in parallel (pytest-xdist).
+    """
+    p = tmp_path / "wal.log"
+    monkeypatch.setenv("CIDSEM_WAL", str(p))
+    return p
+
+
+@pytest.fixture(autouse=True)
+def _api_wal(request):
+    """Give every api test its own WAL; tests needing the path request wal_path."""
+    if request.path.name.startswith("test_api_"):
+        request.getfixturevalue("wal_path")
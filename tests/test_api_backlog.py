@@ -1,38 +1,23 @@
-import pytest
-from fastapi.testclient import TestClient
+import orjson
 
-pytest.importorskip("fastapi")
-from cidsem.api.app import app
+JSON_HEADERS = {"content-type": "application/json"}
 
-client = TestClient(app)
 
+def test_post_backlog_accepts(api_client, backlog_bytes):
+    r = api_client.post("/backlog_items", content=backlog_bytes, headers=JSON_HEADERS)
+    assert r.status_code == 200
+    assert r.json()["status"] == "accepted"
 
-def make_backlog_payload():
-    return {
-        "item_id": "bi-1",
-        "factoid_id": "f-1",
-        "priority": "normal",
-        "created_at": "2025-09-27T12:00:00Z",
-        "attempts": 0,
-    }
 
+def test_post_backlog_ignores_format(api_client, backlog_bytes):
+    # "format" is not enforced, with or without fastjsonschema installed
+    from cidsem.api.app import _validator
 
-def test_post_backlog_accepts(tmp_path, monkeypatch):
-    walp = tmp_path / "wal_back.log"
-    monkeypatch.setenv("CIDSEM_WAL", str(walp))
-    payload = make_backlog_payload()
-    r = client.post("/backlog_items", json=payload)
+    body = {**orjson.loads(backlog_bytes), "created_at": "yesterday"}
+    r = api_client.post(
+        "/backlog_items", content=orjson.dumps(body), headers=JSON_HEADERS
+    )
     assert r.status_code == 200
     assert r.json()["status"] == "accepted"
-
-
-def test_backlog_idempotency(tmp_path, monkeypatch):
-    walp = tmp_path / "wal_back2.log"
-    monkeypatch.setenv("CIDSEM_WAL", str(walp))
-    payload = make_backlog_payload()
-    headers = {"Idempotency-Key": "back-abc-1"}
-    r1 = client.post("/backlog_items", json=payload, headers=headers)
-    assert r1.status_code == 200
-    r2 = client.post("/backlog_items", json=payload, headers=headers)
-    assert r2.status_code == 200
-    assert r2.json()["status"] in ("duplicate", "accepted")
+    validate = _validator({"properties": {"created_at": {"format": "date-time"}}})
+    validate({"created_at": "yesterday"})
@@ -1,32 +1,26 @@
-import pytest
-from fastapi.testclient import TestClient
+import orjson
 
-pytest.importorskip("fastapi")
-from cidsem.api.app import app
-from cidsem.wal import WAL
+CANDIDATE_NO_PREDICATES_PAYLOAD = {
+    "factoid_id": "f-infer-1",
+    "factoid_text": "Alice joined BetaCorp as CTO in 2020.",
+    "provenance": {"msg_cid": "bafy", "chunk_id": "c-1"},
+}
+# serialized once; posted as raw JSON bytes
+CANDIDATE_NO_PREDICATES_BYTES = orjson.dumps(CANDIDATE_NO_PREDICATES_PAYLOAD)
+JSON_HEADERS = {"content-type": "application/json"}
 
-client = TestClient(app)
 
-
-def make_payload_without_candidates():
-    return {
-        "factoid_id": "f-infer-1",
-        "factoid_text": "Alice joined BetaCorp as CTO in 2020.",
-        "provenance": {"msg_cid": "bafy", "chunk_id": "c-1"},
-    }
-
-
-def test_infer_predicates_and_persist(tmp_path, monkeypatch):
-    walp = tmp_path / "wal_infer.log"
-    monkeypatch.setenv("CIDSEM_WAL", str(walp))
-    payload = make_payload_without_candidates()
-    r = client.post("/candidate_factoids", json=payload)
+def test_infer_predicates_and_persist(api_client, wal_path):
+    r = api_client.post(
+        "/candidate_factoids",
+        content=CANDIDATE_NO_PREDICATES_BYTES,
+        headers=JSON_HEADERS,
+    )
     assert r.status_code == 200
-    # read WAL and confirm predicate_candidates were injected
-    w = WAL(str(walp))
-    records = list(w.read_all())
-    assert records, "expected records in WAL"
-    rec = records[-1]
+    # read the last WAL line (JSONL) and confirm predicate_candidates were injected
+    data = wal_path.read_bytes().rstrip(b"\n")
+    assert data, "expected records in WAL"
+    rec = orjson.loads(data.rsplit(b"\n", 1)[-1])
     assert rec["type"] == "candidate_factoid"
     p = rec["payload"].get("predicate_candidates")
     assert p and isinstance(p, list)
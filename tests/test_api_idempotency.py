@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+ENDPOINTS = pytest.mark.parametrize(
+    "endpoint,payload,key",
+    [
+        ("/backlog_items", "backlog_bytes", "back-abc-1"),
+        ("/candidate_factoids", "candidate_bytes", "abc-123"),
+        ("/validation_events", "validation_bytes", "val-abc-1"),
+    ],
+)
+
+
+@ENDPOINTS
+def test_idempotency(request, api_client, endpoint, payload, key):
+    # payload names one of the request-body fixtures in conftest
+    payload = request.getfixturevalue(payload)
+    headers = {**JSON_HEADERS, "Idempotency-Key": key}
+    r1 = api_client.post(endpoint, content=payload, headers=headers)
+    assert r1.status_code == 200
+    r2 = api_client.post(endpoint, content=payload, headers=headers)
+    assert r2.status_code == 200
+    assert r2.json()["status"] == "duplicate"
+
+
+@ENDPOINTS
+@pytest.mark.asyncio
+async def test_idempotency_concurrent_same_key(
+    request, api_client, wal_path, endpoint, payload, key
+):
+    payload = request.getfixturevalue(payload)
+    headers = {**JSON_HEADERS, "Idempotency-Key": key}
+    # the shared TestClient is synchronous; drive its app from this loop
+    transport = httpx.ASGITransport(app=api_client.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        responses = await asyncio.gather(
+            *(c.post(endpoint, content=payload, headers=headers) for _ in range(4))
+        )
+    statuses = sorted(r.json()["status"] for r in responses)
+    assert statuses == ["accepted", "duplicate", "duplicate", "duplicate"]
+    records = [orjson.loads(line) for line in wal_path.read_bytes().splitlines()]
+    assert [r["idempotency_key"] for r in records] == [key]
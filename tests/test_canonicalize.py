@@ -9,3 +9,36 @@ def test_canonical_cid_stability():
     cidb = canonical_cid(b)
     assert cida == cidb
     assert len(cida) == 32  # 16 bytes hex
+
+
+def test_canonicalize_json_matches_stdlib_form():
+    import json
+
+    for obj in (
+        {"z": [1.5, None, True], "a": "é\u0000\"", "m": {"b": 1, "B": 2}},
+        {3: 2**70, 1: "x"},  # handled by the stdlib fallback
+    ):
+        expected = json.dumps(
+            obj, separators=(",", ":"), sort_keys=True, ensure_ascii=False
+        )
+        assert canonicalize_json(obj) == expected
+
+
+def test_canonicalize_json_float_parity_with_stdlib():
+    import json
+
+    for value in (1e16, 1e-7, 1e-5, 123.25, float("nan"), float("inf"), -float("inf")):
+        obj = {"v": value, "l": [0.5, value]}
+        expected = json.dumps(
+            obj, separators=(",", ":"), sort_keys=True, ensure_ascii=False
+        )
+        assert canonicalize_json(obj) == expected
+    assert canonicalize_json({"v": float("nan")}) == '{"v":NaN}'
+    assert canonicalize_json([1e16, -1e-7]) == "[1e+16,-1e-07]"
+
+
+def test_canonical_cids_batch():
+    from cidsem.utils.canonicalize import canonical_cids
+
+    objs = [{"a": 1}, {"b": {1, 2}}, {"c": "x"}]  # sets are not serializable
+    assert canonical_cids(objs) == [canonical_cid(objs[0]), "", canonical_cid(objs[2])]
@@ -5,16 +5,24 @@ Tests the E entity handling, triple insertion, and batch operations
 as described in the cidsem specifications.
 """
 
+import numpy as np
+import pytest
+
+from cidsem import cidstore
 from cidsem.cidstore import (
     CidstoreClient,
     PerformanceConfig,
     TripleRecord,
     create_compound_key,
+    create_keys_batch,
     create_reverse_key,
     extract_context_to_triples,
     robust_batch_insert_with_retry,
+    robust_batch_insert_with_retry_async,
 )
-from cidsem.keys import E
+from cidsem.keys import KEY_DTYPE, E
+
+_U64 = 1 << 64
 
 
 class TestEEntity:
@@ -31,31 +39,28 @@ class TestEEntity:
         assert isinstance(e1, E)
         assert e1.high > 0 or e1.low > 0  # Non-zero entity
 
-    def test_e_high_low_fields(self):
+    def test_e_high_low_fields(self, e):
         """Test E entity high/low field access."""
-        e = E.from_str("test_entity")
+        ent = e("test_entity")
 
-        assert isinstance(e.high, int)
-        assert isinstance(e.low, int)
-        assert 0 <= e.high < (1 << 64)
-        assert 0 <= e.high_mid < (1 << 64)
-        assert 0 <= e.low_mid < (1 << 64)
-        assert 0 <= e.low < (1 << 64)
+        assert isinstance(ent.high, int)
+        assert isinstance(ent.low, int)
+        assert all(0 <= v < _U64 for v in (ent.high, ent.high_mid, ent.low_mid, ent.low))
 
         # Reconstruct E from 4-part representation
-        e2 = E((e.high, e.high_mid, e.low_mid, e.low))
-        assert e == e2
+        e2 = E((ent.high, ent.high_mid, ent.low_mid, ent.low))
+        assert ent == e2
 
-    def test_e_serialization_format(self):
+    def test_e_serialization_format(self, e):
         """Test E entity msgpack serialization format."""
-        e = E.from_str("serialization_test")
+        ent = e("serialization_test")
 
         # Test dict format with high/low fields
         e_dict = {
-            "high": e.high,
-            "high_mid": e.high_mid,
-            "low_mid": e.low_mid,
-            "low": e.low,
+            "high": ent.high,
+            "high_mid": ent.high_mid,
+            "low_mid": ent.low_mid,
+            "low": ent.low,
         }
         e_reconstructed = E((
             e_dict["high"],
@@ -64,17 +69,40 @@ class TestEEntity:
             e_dict["low"],
         ))
 
-        assert e == e_reconstructed
+        assert ent == e_reconstructed
+
+    def test_e_from_entries_matches_from_entry(self, e):
+        """Bulk decoding of KEY_DTYPE rows matches row-by-row decoding."""
+        es = [e(f"entry{i}") for i in range(5)] + [E((_U64 - 1,) * 4)]
+        arr = np.array(
+            [(ent.high, ent.high_mid, ent.low_mid, ent.low) for ent in es], dtype=KEY_DTYPE
+        )
+
+        decoded = E.from_entries(arr)
+
+        assert decoded == [E.from_entry(row) for row in arr] == es
+        assert all(type(ent) is E for ent in decoded)
+
+    def test_e_columns_roundtrip(self, e):
+        """Es split into four contiguous uint64 columns decode back unchanged."""
+        es = [e(f"col{i}") for i in range(5)]
+
+        cols = E.to_columns(es)
+
+        assert len(cols) == 4
+        assert all(c.dtype == np.uint64 and c.flags.c_contiguous for c in cols)
+        assert E.from_columns(*cols) == es
+        assert E.from_entry(tuple(c[2] for c in cols)) == es[2]
 
 
 class TestTripleRecord:
     """Test TripleRecord functionality."""
 
-    def test_triple_record_creation(self):
+    def test_triple_record_creation(self, e):
         """Test creating and serializing TripleRecord."""
-        subject = E.from_str("Alice")
-        predicate = E.from_str("worksAt")
-        obj = E.from_str("BetaCorp")
+        subject = e("Alice")
+        predicate = e("worksAt")
+        obj = e("BetaCorp")
 
         provenance = {"factoid_id": "f-1", "factoid_text": "Alice works at BetaCorp"}
         triple = TripleRecord(subject, predicate, obj, provenance)
@@ -86,11 +114,11 @@ class TestTripleRecord:
         assert triple.schema_version == "v1"
         assert triple.created_at > 0
 
-    def test_triple_record_serialization(self):
+    def test_triple_record_serialization(self, e):
         """Test TripleRecord to_dict/from_dict roundtrip."""
-        subject = E.from_str("Alice")
-        predicate = E.from_str("worksAt")
-        obj = E.from_str("BetaCorp")
+        subject = e("Alice")
+        predicate = e("worksAt")
+        obj = e("BetaCorp")
 
         triple = TripleRecord(subject, predicate, obj)
         triple_dict = triple.to_dict()
@@ -114,10 +142,10 @@ class TestTripleRecord:
 class TestCompoundKeys:
     """Test compound key generation for queries."""
 
-    def test_compound_key_creation(self):
+    def test_compound_key_creation(self, e):
         """Test compound key generation is deterministic."""
-        subject = E.from_str("Alice")
-        predicate = E.from_str("worksAt")
+        subject = e("Alice")
+        predicate = e("worksAt")
 
         key1 = create_compound_key(subject, predicate)
         key2 = create_compound_key(subject, predicate)
@@ -126,14 +154,14 @@ class TestCompoundKeys:
         assert isinstance(key1, E)
 
         # Different inputs should produce different keys
-        predicate2 = E.from_str("livesIn")
+        predicate2 = e("livesIn")
         key3 = create_compound_key(subject, predicate2)
         assert key1 != key3
 
-    def test_reverse_key_creation(self):
+    def test_reverse_key_creation(self, e):
         """Test reverse key generation for object+predicate lookups."""
-        predicate = E.from_str("worksAt")
-        obj = E.from_str("BetaCorp")
+        predicate = e("worksAt")
+        obj = e("BetaCorp")
 
         key1 = create_reverse_key(predicate, obj)
         key2 = create_reverse_key(predicate, obj)
@@ -141,18 +169,36 @@ class TestCompoundKeys:
         assert key1 == key2  # Deterministic
         assert isinstance(key1, E)
 
+    def test_keys_batch_matches_scalar(self, e):
+        """create_keys_batch gives the same lanes as the scalar key functions."""
+        names = [("Alice", "worksAt", "BetaCorp"), ("Bob", "livesIn", "Seattle")]
+        es = [tuple(e(x) for x in row) for row in names]
+        s, p, o = (
+            np.array(
+                [[ents[i].high, ents[i].high_mid, ents[i].low_mid, ents[i].low] for ents in es],
+                dtype=np.uint64,
+            )
+            for i in range(3)
+        )
+
+        compound, reverse = create_keys_batch(s, p, o)
+
+        for row, (subj, pred, obj) in enumerate(es):
+            assert E(tuple(int(x) for x in compound[row])) == create_compound_key(subj, pred)
+            assert E(tuple(int(x) for x in reverse[row])) == create_reverse_key(pred, obj)
+
 
 class TestCidstoreClient:
     """Test CidstoreClient operations."""
 
-    def test_single_triple_insertion(self, cidstore_client):
+    def test_single_triple_insertion(self, cidstore_client, e):
         """Test inserting a single triple."""
         mock_cidstore = cidstore_client
         client = CidstoreClient(mock_cidstore)
 
-        subject = E.from_str("Alice")
-        predicate = E.from_str("worksAt")
-        obj = E.from_str("BetaCorp")
+        subject = e("Alice")
+        predicate = e("worksAt")
+        obj = e("BetaCorp")
         triple = TripleRecord(subject, predicate, obj)
 
         result = client.insert_triple(triple)
@@ -163,7 +209,7 @@ class TestCidstoreClient:
         stored_objects = mock_cidstore.lookup(compound_key)
         assert len(stored_objects) > 0
 
-    def test_batch_triple_insertion(self, cidstore_client):
+    def test_batch_triple_insertion(self, cidstore_client, e):
         """Test batch insertion of multiple triples."""
         mock_cidstore = cidstore_client
         client = CidstoreClient(mock_cidstore)
@@ -171,9 +217,9 @@ class TestCidstoreClient:
         # Create test triples
         triples = []
         for i in range(3):
-            subject = E.from_str(f"Person{i}")
-            predicate = E.from_str("worksAt")
-            obj = E.from_str(f"Company{i}")
+            subject = e(f"Person{i}")
+            predicate = e("worksAt")
+            obj = e(f"Company{i}")
             triple = TripleRecord(subject, predicate, obj)
             triples.append(triple)
 
@@ -182,15 +228,148 @@ class TestCidstoreClient:
         assert result["success_count"] == 3
         assert len(result["failures"]) == 0
 
-    def test_query_by_subject_predicate(self, cidstore_client):
+    def test_insert_triples_single_batch(self, cidstore_client, e):
+        """insert_triples writes the same index entries as insert_triple."""
+        client = CidstoreClient(cidstore_client)
+        triples = [
+            TripleRecord(e(f"Person{i}"), e("worksAt"), e(f"Company{i}"))
+            for i in range(3)
+        ]
+
+        assert client.insert_triples(triples) is True
+
+        for t in triples:
+            assert client.query_by_subject_predicate(t.subject, t.predicate) == [t.object]
+            reverse = client.query_subjects_by_object_predicate(t.object, t.predicate)
+            assert reverse == [t.subject]
+
+    def test_batch_insert_prefers_soa_store(self, e):
+        """Stores with batch_insert_soa get uint64 lane arrays, not dicts."""
+
+        class SoAStore:
+            def __init__(self):
+                self.calls = []
+
+            def batch_insert_soa(self, keys, values):
+                self.calls.append((keys, values))
+
+        store = SoAStore()
+        client = CidstoreClient(store)
+        s, p, o = e("Alice"), e("worksAt"), e("BetaCorp")
+
+        result = client.batch_insert_triples([TripleRecord(s, p, o)])
+
+        assert result["success_count"] == 1
+        (keys, values), = store.calls
+        assert keys.shape == values.shape == (4, 4)
+        assert E(tuple(int(x) for x in keys[0])) == create_compound_key(s, p)
+        assert E(tuple(int(x) for x in values[0])) == o
+        assert E(tuple(int(x) for x in keys[3])) == create_reverse_key(p, o)
+
+    def test_batch_insert_packed_store(self, e):
+        """Stores with batch_insert_packed get one msgpack payload per batch."""
+        msgpack = pytest.importorskip("msgpack")
+
+        class PackedStore:
+            def __init__(self):
+                self.payloads = []
+
+            def batch_insert_packed(self, buf):
+                self.payloads.append(buf)
+
+        store = PackedStore()
+        client = CidstoreClient(store)
+        s, p, o = e("Alice"), e("worksAt"), e("BetaCorp")
+
+        result = client.batch_insert_triples([TripleRecord(s, p, o)])
+
+        assert result["success_count"] == 1
+        (buf,) = store.payloads
+        rows = msgpack.unpackb(buf, raw=False)
+        assert len(rows) == 4
+        assert E(tuple(rows[0][0])) == create_compound_key(s, p)
+        assert E(tuple(rows[0][1])) == o
+
+    def test_batch_insert_prefers_raw_store(self, e):
+        """Stores with batch_insert_raw get (key E, value E) pairs."""
+
+        class RawStore:
+            def __init__(self):
+                self.items = []
+
+            def batch_insert_raw(self, items):
+                self.items.extend(items)
+
+        store = RawStore()
+        client = CidstoreClient(store)
+        client.batch_size = 3  # chunks must not depend on triple boundaries
+        s, p, o = e("Alice"), e("worksAt"), e("BetaCorp")
+        o2 = e("GammaCorp")
+
+        result = client.batch_insert_triples([TripleRecord(s, p, o), TripleRecord(s, p, o2)])
+
+        assert result["failures"] == []
+        assert store.items == [
+            (create_compound_key(s, p), o),
+            (s, p),
+            (p, o),
+            (create_reverse_key(p, o), s),
+            (create_compound_key(s, p), o2),
+            (s, p),
+            (p, o2),
+            (create_reverse_key(p, o2), s),
+        ]
+
+    def test_batch_size_adapts_to_store_feedback(self, e):
+        """Batch size grows after fast batches and halves after failures."""
+
+        class FlakyStore:
+            fail = False
+
+            def batch_insert(self, items):
+                if self.fail:
+                    raise RuntimeError("store unavailable")
+
+        store = FlakyStore()
+        # generous latency target so every successful batch counts as fast
+        client = CidstoreClient(store, PerformanceConfig(target_latency_p99_microsec=10**9))
+        triples = [
+            TripleRecord(e(f"S{i}"), e("p"), e(f"O{i}"))
+            for i in range(64)
+        ]
+
+        client.batch_insert_triples(triples)
+        assert client.batch_size > 128
+
+        store.fail = True
+        grown = client.batch_size
+        result = client.batch_insert_triples(triples[:1])
+        assert result["failures"]
+        assert client.batch_size == max(client.min_batch_size, grown // 2)
+
+    def test_batch_insert_sharded_workers(self, cidstore_client, e):
+        """num_workers > 1 shards entries across threads without losing any."""
+        client = CidstoreClient(cidstore_client, num_workers=3)
+        triples = [
+            TripleRecord(e(f"S{i}"), e("p"), e(f"O{i}"))
+            for i in range(100)
+        ]
+
+        result = client.batch_insert_triples(triples)
+
+        assert result == {"success_count": 100, "failures": []}
+        for t in triples:
+            assert client.query_by_subject_predicate(t.subject, t.predicate) == [t.object]
+
+    def test_query_by_subject_predicate(self, cidstore_client, e):
         """Test querying objects by subject+predicate."""
         mock_cidstore = cidstore_client
         client = CidstoreClient(mock_cidstore)
 
         # Insert a triple
-        subject = E.from_str("Alice")
-        predicate = E.from_str("worksAt")
-        obj = E.from_str("BetaCorp")
+        subject = e("Alice")
+        predicate = e("worksAt")
+        obj = e("BetaCorp")
         triple = TripleRecord(subject, predicate, obj)
 
         client.insert_triple(triple)
@@ -198,22 +377,18 @@ class TestCidstoreClient:
         # Query it back
         objects = client.query_by_subject_predicate(subject, predicate)
         assert len(objects) > 0
-        # Note: The mock cidstore returns tuples, so we need to handle that
-        found_obj = objects[0]
-        if isinstance(found_obj, tuple):
-            found_obj = E(found_obj)
-        assert found_obj == obj
+        assert objects[0] == obj
 
-    def test_query_predicates_for_subject(self, cidstore_client):
+    def test_query_predicates_for_subject(self, cidstore_client, e):
         """Test finding all predicates for a subject."""
         mock_cidstore = cidstore_client
         client = CidstoreClient(mock_cidstore)
 
-        subject = E.from_str("Alice")
-        predicate1 = E.from_str("worksAt")
-        predicate2 = E.from_str("livesIn")
-        obj1 = E.from_str("BetaCorp")
-        obj2 = E.from_str("Seattle")
+        subject = e("Alice")
+        predicate1 = e("worksAt")
+        predicate2 = e("livesIn")
+        obj1 = e("BetaCorp")
+        obj2 = e("Seattle")
 
         # Insert two triples with same subject
         client.insert_triple(TripleRecord(subject, predicate1, obj1))
@@ -239,8 +414,8 @@ class TestContextExtraction:
             }
         ]
 
-        triples = extract_context_to_triples(
-            factoid_text, factoid_id, predicate_candidates
+        triples = list(
+            extract_context_to_triples(factoid_text, factoid_id, predicate_candidates)
         )
 
         assert len(triples) == 1
@@ -253,6 +428,22 @@ class TestContextExtraction:
         assert triple.provenance["factoid_id"] == factoid_id
         assert triple.provenance["factoid_text"] == factoid_text
 
+    def test_extract_context_to_triples_reregisters_evicted_names(self, monkeypatch):
+        """Names evicted from the bounded E value store come back on reuse."""
+        from collections import deque
+
+        from cidsem import keys
+
+        monkeypatch.setattr(keys, "KV_STORE_SIZE", 8)
+        monkeypatch.setattr(keys, "_kv_store", {})
+        monkeypatch.setattr(keys, "_kv_order", deque())
+        candidates = [{"predicate_cid": "cid:pred:joined:v1", "label": "joined"}]
+        list(extract_context_to_triples("x", "f-evict", candidates))
+        for i in range(16):
+            E.from_str(f"filler-{i}")
+        (triple,) = extract_context_to_triples("x", "f-evict", candidates)
+        assert triple.subject.value == "subject_f-evict"
+
 
 class TestPerformanceAndRetry:
     """Test performance optimization and retry logic."""
@@ -285,6 +476,28 @@ class TestPerformanceAndRetry:
         assert result["success_count"] == 2
         assert len(result["failures"]) == 0
 
+    @pytest.mark.asyncio
+    async def test_robust_batch_insert_async_retries(self, monkeypatch):
+        """The async variant retries failed attempts and awaits async clients."""
+        monkeypatch.setattr(cidstore, "_backoff_seconds", lambda config, attempt: 0)
+
+        class AsyncClient:
+            calls = 0
+
+            async def batch_insert_triples(self, triples):
+                self.calls += 1
+                if self.calls == 1:
+                    raise RuntimeError("transient")
+                return {"success_count": len(triples), "failures": []}
+
+        client = AsyncClient()
+        triple = TripleRecord(E.from_str("A"), E.from_str("p"), E.from_str("B"))
+
+        result = await robust_batch_insert_with_retry_async(client, [triple])
+
+        assert result == {"success_count": 1, "failures": []}
+        assert client.calls == 2
+
 
 class TestCidstoreIntegration:
     """Integration tests combining multiple components."""
@@ -305,8 +518,8 @@ class TestCidstoreIntegration:
             }
         ]
 
-        triples = extract_context_to_triples(
-            factoid_text, factoid_id, predicate_candidates
+        triples = list(
+            extract_context_to_triples(factoid_text, factoid_id, predicate_candidates)
         )
         assert len(triples) == 1
 
@@ -1,6 +1,7 @@
-import json
 from pathlib import Path
 
+import orjson
+
 from cidsem.convert_corpus_with_minillm import convert_corpus
 
 
@@ -16,11 +17,11 @@ def test_convert_corpus_creates_triplets(tmp_path: Path):
     }
     infile = tmp_path / "in.json"
     outfile = tmp_path / "out.json"
-    infile.write_text(json.dumps(sample, ensure_ascii=False), encoding="utf-8")
+    infile.write_bytes(orjson.dumps(sample))
 
     convert_corpus(infile, outfile)
 
-    data = json.loads(outfile.read_text(encoding="utf-8"))
+    data = orjson.loads(outfile.read_bytes())
     assert "items" in data
     assert len(data["items"]) == 1
     item = data["items"][0]
@@ -1,3 +1,12 @@
+import re
+
+from cidsem.nlp import spo
+
+# compiled once at import instead of per pattern inside the test
+VERB_REGEXES = [(p, re.compile(re.escape(p)), n) for p, n in spo._VERB_PATTERNS]
+PRONOUNS = frozenset({"he", "she", "they", "we", "i", "you", "it", "his", "her"})
+
+
 def test_debug_itemX006():
     from cidsem.nlp.spo import extract_spo
     from cidsem.utils.factoids import build_factoids
@@ -13,28 +22,26 @@ def test_debug_itemX006():
     for f in factoids:
         print(f)
     # debug internal noun/verb detection
-    from cidsem.nlp import spo
-
     print("\nDEBUG NOUNS AND VERBS")
-    print("nouns (pos,token):", list(spo._find_nouns(text)))
+    # the noun scan is reused by the selection replay below
+    nouns = list(spo._find_nouns(text))
+    print("nouns (pos,token):", nouns)
     verbs = []
     lower = text.lower()
-    for pattern, norm in spo._VERB_PATTERNS:
-        for m in __import__("re").finditer(__import__("re").escape(pattern), lower):
+    for pattern, regex, norm in VERB_REGEXES:
+        for m in regex.finditer(lower):
             verbs.append((m.start(), m.end(), norm, pattern))
     print("verbs (start,end,norm,pattern):", verbs)
     # replicate selection logic for joined verb to inspect why subject became san francisco
     print("\nREPLICATION OF SELECTION LOGIC FOR JOINED:")
     # find joined verb match position
-    import re as _re
-
-    lm = _re.search("joined", text.lower())
+    lm = re.search("joined", text.lower())
     if lm:
         vstart = lm.start()
         vend = lm.end()
         print("vstart, vend for joined:", vstart, vend)
         # noun_matches absolute
-        noun_matches_abs = list(spo._find_nouns(text))
+        noun_matches_abs = nouns
         print("noun_matches_abs:", noun_matches_abs)
         candidates = [
             (st, g) for (st, g) in noun_matches_abs if st < vstart and len(g) > 1
@@ -45,12 +52,11 @@ def test_debug_itemX006():
         if candidates:
             subject_start, subject = sorted(candidates, key=lambda x: x[0])[-1]
         print("initial chosen subject:", subject_start, subject)
-        pronouns = {"he", "she", "they", "we", "i", "you", "it", "his", "her"}
-        if subject and subject.strip().lower() in pronouns:
+        if subject and subject.strip().lower() in PRONOUNS:
             prior = [
                 p
                 for p in noun_matches_abs
-                if p[0] < vstart and p[1].strip().lower() not in pronouns
+                if p[0] < vstart and p[1].strip().lower() not in PRONOUNS
             ]
             print("prior candidates for pronoun resolution:", prior)
             if prior:
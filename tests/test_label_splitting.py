@@ -1,14 +1,14 @@
-import json
+import orjson
 
 from cidsem.nlp import mapper
 
 
 def write_ont(path, payload):
-    with open(path, "w", encoding="utf-8") as fh:
-        json.dump(payload, fh, ensure_ascii=False)
+    # OPT_NON_STR_KEYS coerces keys like json.dump would
+    path.write_bytes(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS))
 
 
-def test_split_exact_three_parts_with_extra_colons(tmp_path, monkeypatch):
+def test_split_exact_three_parts_with_extra_colons(ontology_file):
     # two entries: one simple, one with extra colon(s) in the human label
     ont = {
         "predicates": [
@@ -16,13 +16,13 @@ def test_split_exact_three_parts_with_extra_colons(tmp_path, monkeypatch):
             {"cid": 2, "content": "a:b:c:d", "description": "extra"},
         ]
     }
-    f = tmp_path / "ontology.json"
-    write_ont(f, ont)
-    monkeypatch.setattr(mapper, "ONTO_FILE", str(f))
+    write_ont(ontology_file, ont)
 
     loaded = mapper.load_ontology()
     preds = loaded.get("predicates", [])
     assert len(preds) == 2
+    # memoized on (path, mtime): an unchanged file is not parsed again
+    assert mapper.load_ontology() is loaded
 
     # check split behavior: exactly three parts and human label preserved including extra colons
     for p, expected_label in zip(preds, ["c", "c:d"]):
@@ -32,14 +32,23 @@ def test_split_exact_three_parts_with_extra_colons(tmp_path, monkeypatch):
         assert parts[2] == expected_label
 
 
-def test_load_ontology_rejects_missing_second_colon(tmp_path, monkeypatch):
+def test_load_ontology_rejects_missing_second_colon(ontology_file):
     ont = {"predicates": [{"cid": 3, "content": "foo:bar", "description": "bad"}]}
-    f = tmp_path / "ontology.json"
-    write_ont(f, ont)
-    monkeypatch.setattr(mapper, "ONTO_FILE", str(f))
+    write_ont(ontology_file, ont)
 
     try:
         mapper.load_ontology()
         assert False, "expected ValueError for missing second colon"
     except ValueError as e:
         assert "two colons" in str(e) or "fully-qualified" in str(e)
+
+
+def test_map_predicate_results_do_not_share_nested_values(ontology_file):
+    ont = {"predicates": [{"cid": 1, "content": "R:sys:joined", "aliases": ["hired"]}]}
+    write_ont(ontology_file, ont)
+
+    first = mapper.map_predicate("joined")
+    first["predicate"]["aliases"].append("mutated")
+    again = mapper.map_predicate("joined")
+    assert again["predicate"]["aliases"] == ["hired"]
+    assert mapper.load_ontology()["predicates"][0]["aliases"] == ["hired"]
@@ -9,12 +9,8 @@ class DummyModel:
         # deterministic small embeddings: length of text and first char code
         import numpy as _np
 
-        out = []
-        for t in texts:
-            a = len(t)
-            b = ord(t[0]) if t else 0
-            out.append([a, b])
-        return _np.array(out, dtype=float)
+        flat = (x for t in texts for x in (len(t), ord(t[0]) if t else 0))
+        return _np.fromiter(flat, dtype=float, count=2 * len(texts)).reshape(-1, 2)
 
 
 def test_choose_predicate_with_stub(monkeypatch):
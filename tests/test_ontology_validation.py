@@ -1,14 +1,16 @@
-import json
+import os
+
+import orjson
 
 from cidsem.nlp import mapper
 
 
 def write_ont(path, payload):
-    with open(path, "w", encoding="utf-8") as fh:
-        json.dump(payload, fh, ensure_ascii=False)
+    # OPT_NON_STR_KEYS coerces keys like json.dump would
+    path.write_bytes(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS))
 
 
-def test_load_ontology_accepts_leading_colon_label(tmp_path, monkeypatch):
+def test_load_ontology_accepts_leading_colon_label(ontology_file):
     # prepare a minimal ontology with a content that has a leading colon
     ont = {
         "comment": "test",
@@ -16,11 +18,7 @@ def test_load_ontology_accepts_leading_colon_label(tmp_path, monkeypatch):
             {"cid": 1, "content": "R:sys::startsWithColon", "description": "test"}
         ],
     }
-    f = tmp_path / "ontology.json"
-    write_ont(f, ont)
-
-    # point mapper to the temp file
-    monkeypatch.setattr(mapper, "ONTO_FILE", str(f))
+    write_ont(ontology_file, ont)
 
     loaded = mapper.load_ontology()
     assert "predicates" in loaded
@@ -31,15 +29,52 @@ def test_load_ontology_accepts_leading_colon_label(tmp_path, monkeypatch):
     assert pred.get("label") == ":startsWithColon"
 
 
-def test_load_ontology_rejects_bad_label(tmp_path, monkeypatch):
+def test_load_ontology_rejects_bad_label(ontology_file):
     # missing two colons -> invalid
     ont = {"predicates": [{"cid": 2, "content": "badlabel", "description": "x"}]}
-    f = tmp_path / "ontology.json"
-    write_ont(f, ont)
-    monkeypatch.setattr(mapper, "ONTO_FILE", str(f))
+    write_ont(ontology_file, ont)
 
     try:
         mapper.load_ontology()
         assert False, "expected ValueError for bad label"
     except ValueError as e:
         assert "missing fully-qualified label" in str(e)
+
+
+def test_load_ontology_reloads_after_file_change(ontology_file):
+    f = ontology_file
+    write_ont(f, {"predicates": [{"cid": 1, "content": "R:sys:first"}]})
+
+    assert mapper.load_ontology() is mapper.load_ontology()
+
+    write_ont(f, {"predicates": [{"cid": 2, "content": "R:sys:second"}]})
+    st = f.stat()
+    # force a distinct mtime even on filesystems with coarse timestamps
+    os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert mapper.load_ontology()["predicates"][0]["cid"] == 2
+
+
+def test_clear_ontology_cache_forces_reload(ontology_file):
+    write_ont(ontology_file, {"predicates": [{"cid": 1, "content": "R:sys:first"}]})
+
+    loaded = mapper.load_ontology()
+    mapper._clear_ontology_cache()
+    reloaded = mapper.load_ontology()
+    assert reloaded is not loaded
+    assert reloaded == loaded
+
+
+def test_map_predicates_matches_single_lookups(ontology_file):
+    write_ont(
+        ontology_file,
+        {
+            "predicates": [
+                {"cid": 1, "content": "R:sys:worksAt"},
+                {"cid": 2, "content": "R:sys:livesIn"},
+            ]
+        },
+    )
+    phrases = ["worksAt", "lives in", "zzz", "worksAt"]
+
+    assert mapper.map_predicates(phrases) == [mapper.map_predicate(p) for p in phrases]
@@ -12,7 +12,9 @@ from cidsem.plugins.base import DefaultDataStructure
 class TestDataStructurePlugin:
     """Test the base plugin interface."""
 
-    @pytest.mark.asyncio
+    # one event loop for the whole class instead of one per test
+    pytestmark = pytest.mark.asyncio(loop_scope="class")
+
     async def test_default_plugin_basic_operations(self):
         """Test basic get/set/delete with DefaultDataStructure."""
         plugin = DefaultDataStructure()
@@ -36,7 +38,6 @@ class TestDataStructurePlugin:
         # Delete non-existent
         assert await plugin.delete("bob") is False
 
-    @pytest.mark.asyncio
     async def test_default_plugin_contains(self):
         """Test OSP contains() method."""
         plugin = DefaultDataStructure()
@@ -48,7 +49,6 @@ class TestDataStructurePlugin:
         assert await plugin.contains("alice", 10) is False
         assert await plugin.contains("bob", 5) is False
 
-    @pytest.mark.asyncio
     async def test_default_plugin_find_subjects_not_supported(self):
         """DefaultDataStructure should not support POS queries."""
         plugin = DefaultDataStructure()
@@ -61,7 +61,6 @@ class TestDataStructurePlugin:
         with pytest.raises(NotImplementedError):
             await plugin.find_subjects(5)
 
-    @pytest.mark.asyncio
     async def test_plugin_snapshot_and_restore(self):
         """Test snapshot and restore functionality."""
         plugin1 = DefaultDataStructure()
@@ -87,7 +86,6 @@ class TestDataStructurePlugin:
         assert await plugin2.get("bob") == 10
         assert plugin2.config == {"test": "config"}
 
-    @pytest.mark.asyncio
     async def test_plugin_health_check(self):
         """Test health check returns expected structure."""
         plugin = DefaultDataStructure()
@@ -99,23 +97,31 @@ class TestDataStructurePlugin:
         assert health["plugin"] == "DefaultDataStructure"
         assert health["config"] == {"key": "value"}
 
-    @pytest.mark.asyncio
     async def test_concurrent_access(self):
         """Test plugin handles concurrent access correctly."""
         plugin = DefaultDataStructure()
         plugin.configure({})
 
         # Run many concurrent sets
-        async def set_value(subject, value):
-            await plugin.set(subject, value)
-
-        tasks = [set_value(f"subject_{i % 10}", i) for i in range(100)]
-
-        await asyncio.gather(*tasks)
-
-        # Verify final state is consistent (each subject has highest value)
-        for i in range(10):
-            value = await plugin.get(f"subject_{i}")
-            # Value should be the last write for this subject
-            assert value is not None
-            assert value >= i
+        async with asyncio.TaskGroup() as tg:
+            for i in range(100):
+                tg.create_task(plugin.set(f"subject_{i % 10}", i))
+
+        # Tasks run in creation order, so each subject holds its last write
+        expected = {f"subject_{i}": 90 + i for i in range(10)}
+        async with asyncio.TaskGroup() as tg:
+            gets = {s: tg.create_task(plugin.get(s)) for s in expected}
+        assert {s: t.result() for s, t in gets.items()} == expected
+
+
+# kept outside the class: its asyncio mark applies to every method
+def test_default_plugin_sync_operations():
+    """Sync variants share state with the async API."""
+    plugin = DefaultDataStructure()
+    plugin.configure({})
+
+    plugin.set_sync("alice", 5)
+    assert plugin.get_sync("alice") == 5
+    assert asyncio.run(plugin.get("alice")) == 5
+    assert plugin.delete_sync("alice") is True
+    assert plugin.delete_sync("alice") is False
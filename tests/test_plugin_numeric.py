@@ -8,10 +8,24 @@ from cidsem.plugins.base import QueryCapability
 from cidsem.plugins.numeric import NumericRangeDS
 
 
+@pytest.fixture(scope="module")
+def read_only_plugin():
+    """alice=5, bob=5, charlie=10; shared by the tests that only read it."""
+    plugin = NumericRangeDS()
+    plugin.configure({})
+    # the sync setters need no event loop, so the fixture is loop-agnostic
+    plugin.set_sync("alice", 5)
+    plugin.set_sync("bob", 5)
+    plugin.set_sync("charlie", 10)
+    return plugin
+
+
 class TestNumericRangeDS:
     """Test numeric range plugin functionality."""
 
-    @pytest.mark.asyncio
+    # one event loop for the whole class instead of one per test
+    pytestmark = pytest.mark.asyncio(loop_scope="class")
+
     async def test_basic_numeric_storage(self):
         """Test basic get/set with numeric values."""
         plugin = NumericRangeDS()
@@ -25,7 +39,6 @@ class TestNumericRangeDS:
         assert await plugin.get("bob") == 10
         assert await plugin.get("charlie") == 3
 
-    @pytest.mark.asyncio
     async def test_numeric_bounds_validation(self):
         """Test min/max value enforcement."""
         plugin = NumericRangeDS()
@@ -46,7 +59,6 @@ class TestNumericRangeDS:
         with pytest.raises(ValueError, match="above maximum"):
             await plugin.set("charlie", 101)
 
-    @pytest.mark.asyncio
     async def test_type_validation(self):
         """Test that non-numeric values are rejected."""
         plugin = NumericRangeDS()
@@ -55,19 +67,13 @@ class TestNumericRangeDS:
         with pytest.raises(TypeError, match="requires numeric value"):
             await plugin.set("alice", "not a number")
 
-    @pytest.mark.asyncio
-    async def test_reverse_lookup(self):
+    async def test_reverse_lookup(self, read_only_plugin):
         """Test POS queries via find_subjects()."""
-        plugin = NumericRangeDS()
-        plugin.configure({})
+        plugin = read_only_plugin
 
-        await plugin.set("alice", 5)
-        await plugin.set("bob", 5)
-        await plugin.set("charlie", 10)
-
-        # Find all subjects with value 5
-        subjects = await plugin.find_subjects(5)
-        assert set(subjects) == {"alice", "bob"}
+        # Find all subjects with value 5 (bucket order is unspecified)
+        assert await plugin.find_subjects_set(5) == {"alice", "bob"}
+        assert sorted(await plugin.find_subjects(5)) == ["alice", "bob"]
 
         # Find subjects with value 10
         subjects = await plugin.find_subjects(10)
@@ -77,7 +83,6 @@ class TestNumericRangeDS:
         subjects = await plugin.find_subjects(99)
         assert subjects == []
 
-    @pytest.mark.asyncio
     async def test_range_queries(self):
         """Test range queries with find_subjects_in_range()."""
         plugin = NumericRangeDS()
@@ -100,7 +105,6 @@ class TestNumericRangeDS:
         subjects = await plugin.find_subjects_in_range(100, 200)
         assert subjects == []
 
-    @pytest.mark.asyncio
     async def test_update_maintains_indices(self):
         """Test that updates correctly maintain both indices."""
         plugin = NumericRangeDS()
@@ -109,19 +113,15 @@ class TestNumericRangeDS:
         # Initial set
         await plugin.set("alice", 5)
         assert await plugin.get("alice") == 5
-        assert set(await plugin.find_subjects(5)) == {"alice"}
+        assert plugin._reverse_view() == {5: {"alice"}}
 
         # Update to new value
         await plugin.set("alice", 10)
         assert await plugin.get("alice") == 10
 
-        # Old value should have no subjects
-        assert await plugin.find_subjects(5) == []
-
-        # New value should have alice
-        assert set(await plugin.find_subjects(10)) == {"alice"}
+        # Old value should have no subjects, new value should have alice
+        assert plugin._reverse_view() == {10: {"alice"}}
 
-    @pytest.mark.asyncio
     async def test_delete_maintains_indices(self):
         """Test that delete removes from both indices."""
         plugin = NumericRangeDS()
@@ -131,44 +131,38 @@ class TestNumericRangeDS:
         await plugin.set("bob", 5)
 
         # Both in range index
-        assert set(await plugin.find_subjects(5)) == {"alice", "bob"}
+        assert plugin._reverse_view() == {5: {"alice", "bob"}}
 
         # Delete alice
         assert await plugin.delete("alice") is True
 
         # Only bob remains
-        assert await plugin.find_subjects(5) == ["bob"]
+        assert plugin._reverse_view() == {5: {"bob"}}
         assert await plugin.get("alice") is None
 
-    @pytest.mark.asyncio
-    async def test_capabilities(self):
+        # alice's interned id is reused rather than growing the table
+        await plugin.set("carol", 7)
+        assert len(plugin._subjects) == 2
+        assert plugin._reverse_view() == {5: {"bob"}, 7: {"carol"}}
+
+    async def test_capabilities(self, read_only_plugin):
         """Test that NumericRangeDS declares correct capabilities."""
-        plugin = NumericRangeDS()
-        capabilities = plugin.supported_capabilities()
+        capabilities = read_only_plugin.supported_capabilities()
 
         assert QueryCapability.SPO in capabilities
         assert QueryCapability.OSP in capabilities
         assert QueryCapability.POS in capabilities
         assert QueryCapability.RANGE in capabilities
 
-    @pytest.mark.asyncio
-    async def test_health_check_metrics(self):
+    async def test_health_check_metrics(self, read_only_plugin):
         """Test health check includes useful metrics."""
-        plugin = NumericRangeDS()
-        plugin.configure({})
-
-        await plugin.set("alice", 5)
-        await plugin.set("bob", 5)
-        await plugin.set("charlie", 10)
-
-        health = await plugin.health_check()
+        health = await read_only_plugin.health_check()
 
         assert health["status"] == "ok"
         assert health["metrics"]["subject_count"] == 3
         assert health["metrics"]["unique_values"] == 2
         assert health["metrics"]["avg_subjects_per_value"] == 1.5
 
-    @pytest.mark.asyncio
     async def test_snapshot_and_restore(self):
         """Test snapshot preserves range indices."""
         plugin1 = NumericRangeDS()
@@ -190,8 +184,22 @@ class TestNumericRangeDS:
         assert await plugin2.get("bob") == 10
 
         # Verify reverse index
-        assert set(await plugin2.find_subjects(5)) == {"alice", "charlie"}
-        assert await plugin2.find_subjects(10) == ["bob"]
+        assert plugin2._reverse_view() == {5: {"alice", "charlie"}, 10: {"bob"}}
 
         # Verify config
         assert plugin2.config == {"min_value": 0, "max_value": 100}
+
+    async def test_range_queries_follow_writes(self):
+        """Test range results reflect updates and deletes after a query."""
+        plugin = NumericRangeDS()
+        plugin.configure({})
+
+        await plugin.set("alice", 5)
+        await plugin.set("bob", 7.5)
+        assert set(await plugin.find_subjects_in_range(5, 8)) == {"alice", "bob"}
+
+        await plugin.set("alice", 9)
+        await plugin.delete("bob")
+        await plugin.set("carol", 6)
+        assert await plugin.find_subjects_in_range(5, 8) == ["carol"]
+        assert await plugin.find_subjects_in_range(5.5, 9) == ["carol", "alice"]
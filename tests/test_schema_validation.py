@@ -1,5 +1,5 @@
-import json
 import os
+from functools import lru_cache
 
 import pytest
 
@@ -11,19 +11,25 @@ SCHEMAS = os.path.join(HERE, "..", "docs", "spec", "schemas")
 FIXTURES = os.path.join(HERE, "fixtures")
 
 
-def load(name):
-    path = os.path.join(SCHEMAS, name)
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+@pytest.fixture(scope="session")
+def validator(load_json):
+    """Return ``validator(name)``: a checked validator for a schema, built once."""
 
+    @lru_cache(maxsize=None)
+    def get(name):
+        schema = load_json(os.path.join(SCHEMAS, name))
+        cls = jsonschema.validators.validator_for(schema)
+        cls.check_schema(schema)
+        return cls(schema)
 
-def test_chunk_validates():
-    schema = load("chunk.v1.json")
-    fixture = json.load(open(os.path.join(FIXTURES, "sample_chunk.json")))
-    jsonschema.validate(instance=fixture, schema=schema)
+    return get
 
 
-def test_candidate_factoid_validates():
-    schema = load("candidate_factoid.v1.json")
-    fixture = json.load(open(os.path.join(FIXTURES, "sample_candidate_factoid.json")))
-    jsonschema.validate(instance=fixture, schema=schema)
+def test_chunk_validates(load_json, validator):
+    fixture = load_json(os.path.join(FIXTURES, "sample_chunk.json"))
+    validator("chunk.v1.json").validate(fixture)
+
+
+def test_candidate_factoid_validates(load_json, validator):
+    fixture = load_json(os.path.join(FIXTURES, "sample_candidate_factoid.json"))
+    validator("candidate_factoid.v1.json").validate(fixture)
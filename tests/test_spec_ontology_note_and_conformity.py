@@ -1,22 +1,43 @@
-import os
+import re
+from pathlib import Path
+
+import pytest
 
 from cidsem.nlp import mapper
 
+SPEC23_PATH = (
+    Path(__file__).parent.parent / "docs" / "specs" / "spec23-Ontology.md"
+).resolve()
+
+
+# phrases spec23 must contain: the label note, the grammar terms and the
+# updated examples
+SPEC23_NEEDLES = (
+    "Label format enforcement",
+    "kind:namespace:label",
+    "Entities: `E:<namespace>:<label>`",
+    "Relations: `R:<namespace>:<label>`",
+    "Events: `EV:<namespace>:<label>`",
+    "Literals: `L:<type>:<value>`",
+    "::justLabel",
+)
+# one scan for all needles; the lookahead reports a match at every position,
+# so overlapping needles are all seen (none is a prefix of another)
+_SPEC23_NEEDLES_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, SPEC23_NEEDLES)) + "))"
+)
+
+
+@pytest.fixture(scope="session")
+def spec23_text():
+    return SPEC23_PATH.read_text(encoding="utf-8")
+
 
-def test_spec23_contains_label_note():
-    here = os.path.dirname(__file__)
-    path = os.path.join(here, "..", "docs", "specs", "spec23-Ontology.md")
-    with open(path, "r", encoding="utf-8") as fh:
-        content = fh.read()
-    assert "Label format enforcement" in content
-    assert "kind:namespace:label" in content
-    # grammar terms
-    assert "Entities: `E:<namespace>:<label>`" in content
-    assert "Relations: `R:<namespace>:<label>`" in content
-    assert "Events: `EV:<namespace>:<label>`" in content
-    assert "Literals: `L:<type>:<value>`" in content
-    # updated examples / notes
-    assert "::justLabel" in content
+def test_spec23_contains_label_note(spec23_text):
+    content = spec23_text
+    found = {m.group(1) for m in _SPEC23_NEEDLES_RE.finditer(content)}
+    missing = [n for n in SPEC23_NEEDLES if n not in found]
+    assert missing == [], f"spec23 is missing: {missing}"
     assert ("sha1" in content.lower()) or ("human-readable description" in content)
 
 
@@ -34,3 +34,12 @@ def test_no_verb():
     triples = extract_spo(s)
     # Should probably find something because 'is' maps to 'be', but ensure function runs
     assert isinstance(triples, list)
+
+
+def test_extract_spo_cached_results_are_independent():
+    extract_spo.cache_clear()
+    s = "Alice joined Acme."
+    first = extract_spo(s)
+    first.append(("x", "y", "z"))
+    assert extract_spo(s) == first[:-1]
+    assert extract_spo.cache_info().hits == 1
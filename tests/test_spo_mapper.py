@@ -1,5 +1,5 @@
-from cidsem.nlp.mapper import map_predicate
-from cidsem.nlp.spo import extract_spo
+from cidsem.nlp.mapper import map_predicate, map_predicates
+from cidsem.nlp.spo import extract_spo, extract_spo_mapped
 
 
 def test_simple_extraction_and_map():
@@ -18,3 +18,10 @@ def test_simple_extraction_and_map():
 def test_no_verb_returns_empty():
     s = "QWERTY ZXCVB 1234"
     assert extract_spo(s) == []
+
+
+def test_extract_spo_mapped_matches_separate_passes():
+    s = "Alice joined BetaCorp in 2018. Bob left Acme."
+    triples = extract_spo(s)
+    mapped = map_predicates([pred for _, pred, _ in triples])
+    assert extract_spo_mapped(s) == [(*t, m) for t, m in zip(triples, mapped)]
@@ -0,0 +1,41 @@
+"""Tests for the columnar TripleArray."""
+
+from cidsem.cidstore import CidstoreClient, TripleRecord
+from cidsem.keys import E
+from cidsem.triple_array import TripleArray
+
+
+def _records(n):
+    return [
+        TripleRecord(
+            E.from_str(f"Person{i}"),
+            E.from_str("worksAt"),
+            E.from_str(f"Company{i}"),
+            {"factoid_id": f"f{i}"},
+        )
+        for i in range(n)
+    ]
+
+
+def test_triple_array_roundtrip():
+    records = _records(3)
+    arr = TripleArray.from_records(records)
+
+    assert len(arr) == 3
+    for rec, got in zip(records, arr):
+        assert got.subject == rec.subject
+        assert got.predicate == rec.predicate
+        assert got.object == rec.object
+        assert got.provenance == rec.provenance
+        assert got.created_at == rec.created_at
+
+
+def test_batch_insert_accepts_triple_array(cidstore_client):
+    records = _records(5)
+    client = CidstoreClient(cidstore_client)
+
+    result = client.batch_insert_triples(TripleArray.from_records(records))
+
+    assert result == {"success_count": 5, "failures": []}
+    for rec in records:
+        assert client.query_by_subject_predicate(rec.subject, rec.predicate) == [rec.object]
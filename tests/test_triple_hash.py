@@ -1,7 +1,12 @@
 """Tests for triple hashing and cache integration."""
 
 from cidsem.cidstore import TripleRecord
-from cidsem.hashcache import get_triple_hash
+from cidsem.hashcache import (
+    compute_hash_from_triple,
+    get_triple_hash,
+    hash_many,
+    hash_triples,
+)
 from cidsem.keys import E
 
 
@@ -18,6 +23,22 @@ def test_triple_hash_consistency():
     assert h1 == h2
     assert isinstance(e1, E)
     assert e1 == e2
+    assert compute_hash_from_triple(t) == (h1, e1)
+
+
+def test_batch_hashes_match_single():
+    triples = [
+        TripleRecord(E.from_str(f"S{i}"), E.from_str("worksAt"), E.from_str(f"O{i}"))
+        for i in range(3)
+    ]
+    expected = [get_triple_hash(t) for t in triples]
+    lanes = [
+        [lane for e in (t.subject, t.predicate, t.object) for lane in (e.high, e.high_mid, e.low_mid, e.low)]
+        for t in triples
+    ]
+
+    assert hash_triples(triples) == expected
+    assert hash_many(lanes) == expected
 
 
 def test_provenance_contains_hash():
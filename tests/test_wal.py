@@ -1,13 +1,21 @@
+import asyncio
+
+import pytest
+
 from cidsem.wal import WAL
 
 
-def test_wal_append_and_read(tmp_path):
+@pytest.mark.parametrize("batched", [False, True], ids=["append", "append_batch"])
+def test_wal_append_and_read(tmp_path, batched):
     p = tmp_path / "testwal" / "wal.log"
     wal = WAL(str(p))
     r1 = {"id": 1, "idempotency_key": "abc", "payload": {"x": 1}}
     r2 = {"id": 2, "idempotency_key": "def", "payload": {"x": 2}}
-    wal.append(r1)
-    wal.append(r2)
+    if batched:
+        wal.append_batch([r1, r2])
+    else:
+        wal.append(r1)
+        wal.append(r2)
 
     entries = list(wal.read_all())
     assert len(entries) == 2
@@ -28,3 +36,67 @@ def test_wal_replay(tmp_path):
 
     wal.replay(handler)
     assert seen == [3]
+
+
+def test_wal_append_async_batches(tmp_path):
+    p = tmp_path / "testwal3" / "wal.log"
+    wal = WAL(str(p))
+
+    async def main():
+        await asyncio.gather(*(wal.append_async({"id": i}) for i in range(50)))
+        await wal.append_async({"id": 50, "idempotency_key": "late"})
+
+    asyncio.run(main())
+    assert [r["id"] for r in wal.read_all()] == list(range(51))
+    assert wal.find_by_idempotency_key("late")["id"] == 50
+
+
+def test_wal_append_batch_and_close(tmp_path):
+    p = tmp_path / "testwal4" / "wal.log"
+    with WAL(str(p), fsync=True) as wal:
+        wal.append_batch([{"id": i} for i in range(3)])
+        wal.append_batch([])
+        wal.append({"id": 3})
+    assert wal._fh.closed
+    wal.close()  # idempotent
+    with WAL(str(p)) as reader:
+        assert [r["id"] for r in reader.read_all()] == [0, 1, 2, 3]
+
+
+def test_wal_idempotency_index_survives_reopen(tmp_path):
+    p = tmp_path / "testwal5" / "wal.log"
+    with WAL(str(p)) as wal:
+        wal.append({"id": 1, "idempotency_key": "k1"})
+        wal.append_batch([{"id": 2}, {"id": 3, "idempotency_key": "k2"}])
+        wal.append({"id": 4, "idempotency_key": "k1"})  # first record wins
+        assert wal.find_by_idempotency_key("k2")["id"] == 3
+        assert wal.find_by_idempotency_key("missing") is None
+    with WAL(str(p)) as wal:
+        assert wal.find_by_idempotency_key("k1")["id"] == 1
+        assert wal.find_by_idempotency_key("k2")["id"] == 3
+
+
+def test_wal_append_batch_larger_than_iov_max(tmp_path):
+    p = tmp_path / "testwal6" / "wal.log"
+    with WAL(str(p)) as wal:
+        wal.append_batch({"id": i} for i in range(5000))
+        assert sum(1 for _ in wal.read_all()) == 5000
+
+
+def test_wal_index_sees_other_writers_on_same_path(tmp_path):
+    p = tmp_path / "testwal7" / "wal.log"
+    with WAL(str(p)) as a, WAL(str(p)) as b:
+        a.append({"id": 1, "idempotency_key": "ka"})
+        b.append({"id": 2, "idempotency_key": "kb"})
+        a.append_batch([{"id": 3}, {"id": 4, "idempotency_key": "ka2"}])
+        assert a.find_by_idempotency_key("kb")["id"] == 2
+        assert b.find_by_idempotency_key("ka")["id"] == 1
+        assert b.find_by_idempotency_key("ka2")["id"] == 4
+        assert a.find_by_idempotency_key("missing") is None
+    # a rewrite leaves stale offsets, possibly mid-line, in an open WAL
+    with WAL(str(p)) as wal:
+        assert wal.find_by_idempotency_key("ka2")["id"] == 4
+        p.write_bytes(
+            b'{"id":5,"idempotency_key":"k5"}\n{"id":6,"idempotency_key":"ka2"}\n'
+        )
+        assert wal.find_by_idempotency_key("ka2")["id"] == 6